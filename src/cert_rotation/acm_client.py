@@ -2,26 +2,47 @@
 AWS Certificate Manager client for certificate operations.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
+from cachetools import TTLCache
 
-from .config import settings
+from .aws import get_client
+from .cert_monitor import CertificateMonitor
+from .config import get_settings
+
+settings = get_settings()
 
 
 logger = logging.getLogger(__name__)
 
+# Largest page size accepted by ACM ListCertificates
+LIST_PAGE_SIZE = 1000
+
 
 class ACMClient:
     """AWS Certificate Manager client."""
     
-    def __init__(self):
-        """Initialize ACM client."""
+    def __init__(self, cert_monitor: Optional[CertificateMonitor] = None):
+        """
+        Initialize ACM client.
+
+        If cert_monitor is given, cached metadata is dropped whenever a
+        local certificate file changes.
+        """
+        # Keep in-flight calls within the connection pool so concurrent
+        # requests reuse connections instead of opening new ones
+        self._semaphore = asyncio.Semaphore(settings.aws_max_pool_connections)
+        # Certificate metadata rarely changes between syncs, so cache
+        # describe/list-tags responses per ARN
+        self._details_cache: TTLCache[str, Dict] = TTLCache(maxsize=1024, ttl=settings.acm_cache_ttl_seconds)
+        self._tags_cache: TTLCache[str, Dict] = TTLCache(maxsize=1024, ttl=settings.acm_cache_ttl_seconds)
+        # (operation, ARN) -> in-flight call shared by concurrent cache misses
+        self._inflight: Dict[Tuple[str, str], asyncio.Task[Dict]] = {}
         try:
-            self.client = boto3.client('acm', region_name=settings.aws_region)
+            self.client = get_client('acm')
             logger.info(f"Initialized ACM client for region: {settings.aws_region}")
         except NoCredentialsError:
             logger.error("AWS credentials not found. Ensure EC2 instance has proper IAM role.")
@@ -29,21 +50,76 @@ class ACMClient:
         except Exception as e:
             logger.error(f"Failed to initialize ACM client: {e}")
             raise
-    
+
+        if cert_monitor is not None:
+            cert_monitor.add_change_callback(self._on_certificate_file_changed)
+
+    async def _call(self, operation: str, **kwargs: Any) -> Any:
+        """Run a blocking ACM API call in a worker thread."""
+        async with self._semaphore:
+            return await asyncio.to_thread(getattr(self.client, operation), **kwargs)
+
+    async def _paginate(self, operation: str, **kwargs: Any) -> List[Dict]:
+        """Collect all pages of a paginated API call in a worker thread."""
+        paginator = self.client.get_paginator(operation)
+        async with self._semaphore:
+            return await asyncio.to_thread(lambda: list(paginator.paginate(**kwargs)))
+
+    async def _cached_call(self, cache: TTLCache[str, Dict], operation: str, cert_arn: str) -> Dict:
+        """
+        Run an ACM API call for a certificate, serving repeated calls from cache.
+
+        Concurrent callers for the same ARN share a single in-flight request.
+        """
+        response = cache.get(cert_arn)
+        if response is not None:
+            return response
+
+        key = (operation, cert_arn)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill_cache(cache, operation, cert_arn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: Tuple[str, str], task: asyncio.Task[Dict]) -> None:
+        """Forget a finished in-flight call, retrieving its exception."""
+        self._inflight.pop(key, None)
+        # Every waiter may have been cancelled, leaving the exception unread
+        if not task.cancelled():
+            task.exception()
+
+    async def _fill_cache(self, cache: TTLCache[str, Dict], operation: str, cert_arn: str) -> Dict:
+        """Run an ACM API call for a certificate and cache the response."""
+        response: Dict = await self._call(operation, CertificateArn=cert_arn)
+        cache[cert_arn] = response
+        return response
+
+    def invalidate_cache(self, cert_arn: str) -> None:
+        """Drop cached metadata for a certificate."""
+        self._details_cache.pop(cert_arn, None)
+        self._tags_cache.pop(cert_arn, None)
+
+    def _on_certificate_file_changed(self, file_path: str) -> None:
+        """Drop all cached metadata when a local certificate file changes."""
+        # Local files don't record the ARN they came from
+        self._details_cache.clear()
+        self._tags_cache.clear()
+
     async def get_certificate_details(self, cert_arn: str, include_tags: bool = False) -> Optional[Dict]:
         """Get certificate details from ACM."""
         try:
-            response = self.client.describe_certificate(CertificateArn=cert_arn)
+            response = await self._cached_call(self._details_cache, 'describe_certificate', cert_arn)
             cert_details = response.get('Certificate')
 
+            # Copy so callers (and the tag merge below) don't mutate the cache
+            if cert_details:
+                cert_details = dict(cert_details)
+
             # Add tags if requested
             if include_tags and cert_details:
-                try:
-                    tags_response = self.client.list_tags_for_certificate(CertificateArn=cert_arn)
-                    cert_details['Tags'] = tags_response.get('Tags', [])
-                except ClientError as e:
-                    logger.warning(f"Could not fetch tags for certificate {cert_arn}: {e}")
-                    cert_details['Tags'] = []
+                cert_details['Tags'] = await self.get_certificate_tags(cert_arn)
 
             return cert_details
         except ClientError as e:
@@ -76,7 +152,7 @@ class ACMClient:
 
         try:
             # Try without passphrase (for AWS-issued certificates)
-            response = self.client.export_certificate(CertificateArn=cert_arn)
+            response = await self._call('export_certificate', CertificateArn=cert_arn)
 
             certificate = response.get('Certificate', '')
             private_key = response.get('PrivateKey', '')
@@ -87,6 +163,7 @@ class ACMClient:
                 return None
 
             logger.info(f"Successfully exported certificate: {cert_arn}")
+            self.invalidate_cache(cert_arn)
             return certificate, private_key, certificate_chain
 
         except ClientError as e:
@@ -134,7 +211,8 @@ class ACMClient:
         for passphrase in passphrases_to_try:
             try:
                 logger.debug(f"Trying to export {cert_arn} with passphrase")
-                response = self.client.export_certificate(
+                response = await self._call(
+                    'export_certificate',
                     CertificateArn=cert_arn,
                     Passphrase=passphrase
                 )
@@ -145,6 +223,7 @@ class ACMClient:
 
                 if certificate and private_key:
                     logger.info(f"Successfully exported certificate with passphrase: {cert_arn}")
+                    self.invalidate_cache(cert_arn)
                     return certificate, private_key, certificate_chain
 
             except ClientError:
@@ -154,28 +233,42 @@ class ACMClient:
         logger.error(f"Could not export certificate {cert_arn} - passphrase required but not configured")
         return None
     
-    async def list_certificates(self, include_tags: bool = False) -> List[Dict]:
-        """List all certificates in ACM."""
+    async def get_certificate_tags(self, cert_arn: str) -> List[Dict]:
+        """
+        Get tags for a single certificate.
+
+        Lets callers of list_certificates() hydrate tags only for the
+        certificates they actually care about.
+        """
         try:
-            certificates = []
-            paginator = self.client.get_paginator('list_certificates')
+            tags_response = await self._cached_call(self._tags_cache, 'list_tags_for_certificate', cert_arn)
+            return list(tags_response.get('Tags', []))
+        except ClientError as e:
+            logger.warning(f"Could not fetch tags for certificate {cert_arn}: {e}")
+            return []
 
-            for page in paginator.paginate():
-                cert_list = page.get('CertificateSummaryList', [])
+    async def list_certificates(self, include_tags: bool = False) -> List[Dict]:
+        """
+        List all certificates in ACM.
 
-                # Add tags if requested
-                if include_tags:
-                    for cert in cert_list:
-                        cert_arn = cert.get('CertificateArn')
-                        if cert_arn:
-                            try:
-                                tags_response = self.client.list_tags_for_certificate(CertificateArn=cert_arn)
-                                cert['Tags'] = tags_response.get('Tags', [])
-                            except ClientError as e:
-                                logger.warning(f"Could not fetch tags for certificate {cert_arn}: {e}")
-                                cert['Tags'] = []
+        Tags cost one extra API call per certificate, so they are only
+        fetched when include_tags is set; use get_certificate_tags() to
+        fetch them for individual certificates instead.
+        """
+        try:
+            certificates = []
+            pages = await self._paginate(
+                'list_certificates',
+                PaginationConfig={'PageSize': LIST_PAGE_SIZE}
+            )
+            for page in pages:
+                certificates.extend(page.get('CertificateSummaryList', []))
 
-                certificates.extend(cert_list)
+            # Add tags if requested, for all pages at once
+            if include_tags:
+                await asyncio.gather(
+                    *(self._attach_tags(cert) for cert in certificates if cert.get('CertificateArn'))
+                )
 
             logger.debug(f"Found {len(certificates)} certificates in ACM")
             return certificates
@@ -184,13 +277,24 @@ class ACMClient:
             logger.error(f"Error listing certificates: {e}")
             raise
     
+    async def _attach_tags(self, cert: Dict) -> None:
+        """Fetch tags for a certificate summary and store them under 'Tags'."""
+        cert['Tags'] = await self.get_certificate_tags(cert['CertificateArn'])
+
     async def get_monitored_certificates(self, include_tags: bool = False) -> Dict[str, Dict]:
         """Get details for all monitored certificates."""
-        monitored_certs = {}
+        monitored_certs: Dict[str, Dict] = {}
+        cert_arns = settings.acm_cert_arns
 
-        for cert_arn in settings.acm_cert_arns_list:
-            cert_details = await self.get_certificate_details(cert_arn, include_tags=include_tags)
-            if cert_details:
+        results = await asyncio.gather(
+            *(self.get_certificate_details(arn, include_tags=include_tags) for arn in cert_arns),
+            return_exceptions=True
+        )
+
+        for cert_arn, cert_details in zip(cert_arns, results):
+            if isinstance(cert_details, BaseException):
+                logger.warning(f"Could not get details for monitored certificate {cert_arn}: {cert_details}")
+            elif cert_details:
                 monitored_certs[cert_arn] = cert_details
             else:
                 logger.warning(f"Could not get details for monitored certificate: {cert_arn}")
@@ -200,7 +304,7 @@ class ACMClient:
     def get_certificate_name(self, cert_details: Dict) -> str:
         """Extract a suitable filename from certificate details."""
         # Try to get domain name from certificate
-        domain_name = cert_details.get('DomainName', '')
+        domain_name: str = cert_details.get('DomainName', '')
         if domain_name:
             # Replace wildcards and special characters
             safe_name = domain_name.replace('*', 'wildcard').replace('.', '_')
@@ -209,11 +313,11 @@ class ACMClient:
         # Fallback to subject alternative names
         san_list = cert_details.get('SubjectAlternativeNames', [])
         if san_list:
-            primary_san = san_list[0].replace('*', 'wildcard').replace('.', '_')
+            primary_san: str = san_list[0].replace('*', 'wildcard').replace('.', '_')
             return primary_san
         
         # Last resort: use part of ARN
-        cert_arn = cert_details.get('CertificateArn', '')
+        cert_arn: str = cert_details.get('CertificateArn', '')
         if cert_arn:
             return cert_arn.split('/')[-1][:16]
         
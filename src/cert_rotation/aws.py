@@ -0,0 +1,102 @@
+"""
+Shared AWS session and client construction.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import boto3
+import botocore.session
+from botocore.client import BaseClient
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError
+
+from .config import get_settings
+
+settings = get_settings()
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_session: Optional[boto3.session.Session] = None
+_clients: Dict[Tuple[str, str], BaseClient] = {}
+
+CONTAINER_CREDENTIALS_ENV_VARS = (
+    'AWS_CONTAINER_CREDENTIALS_RELATIVE_URI',
+    'AWS_CONTAINER_CREDENTIALS_FULL_URI',
+)
+
+
+def _create_botocore_session() -> botocore.session.Session:
+    """
+    Create the botocore session and resolve its credentials up front.
+
+    When container credentials are configured the EC2 instance metadata
+    provider is dropped from the chain, so a failed container lookup does
+    not fall through to a slow IMDS probe. Setting AWS_EC2_METADATA_DISABLED
+    disables IMDS everywhere else. Resolved credentials are kept by the
+    session and refreshed by their provider before they expire.
+    """
+    session = botocore.session.Session()
+
+    if any(os.environ.get(name) for name in CONTAINER_CREDENTIALS_ENV_VARS):
+        resolver = session.get_component('credential_provider')
+        resolver.remove('iam-role')
+        logger.debug("Container credentials configured, skipping EC2 instance metadata")
+
+    try:
+        credentials = session.get_credentials()
+        if credentials is None:
+            logger.warning("No AWS credentials found")
+        else:
+            credentials.get_frozen_credentials()
+            logger.debug(f"Resolved AWS credentials via: {credentials.method}")
+    except BotoCoreError as e:
+        logger.warning(f"Failed to resolve AWS credentials: {e}")
+
+    return session
+
+
+def get_session() -> boto3.session.Session:
+    """Get the process-wide boto3 session, creating it on first use."""
+    global _session
+
+    with _lock:
+        if _session is None:
+            _session = boto3.session.Session(botocore_session=_create_botocore_session())
+        return _session
+
+
+def get_client_config() -> Config:
+    """Build the botocore config shared by all AWS clients."""
+    return Config(
+        max_pool_connections=settings.aws_max_pool_connections,
+        retries={'max_attempts': settings.aws_max_attempts, 'mode': settings.aws_retry_mode},
+        tcp_keepalive=True,
+    )
+
+
+def get_client(service: str) -> BaseClient:
+    """
+    Get a long-lived client for an AWS service.
+
+    Clients are created once per service and region and reused, so the
+    credential chain, endpoint resolution and connection pool are set up
+    only once per process. boto3 clients are thread-safe.
+    """
+    key = (service, settings.aws_region)
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = get_session().client(
+                service,
+                region_name=settings.aws_region,
+                config=get_client_config()
+            )
+            _clients[key] = client
+            logger.debug(f"Created {service} client for region: {settings.aws_region}")
+        return client
@@ -2,68 +2,86 @@
 Certificate monitoring and file system operations.
 """
 
+import asyncio
+import hashlib
+import heapq
+import itertools
 import logging
 import os
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from cryptography import x509
-from cryptography.hazmat.backends import default_backend
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
+from watchdog.observers.polling import PollingObserver
 
-from .config import settings
+from .config import get_settings
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
+# Certificate loading is file I/O plus OpenSSL parsing, which releases the
+# GIL, so scans fan out over a thread pool instead of blocking the event loop
+_LOAD_POOL = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="cert-load"
+)
+
 
 class CertificateInfo:
     """Container for certificate information."""
 
-    def __init__(self, path: str, cert_data: str, key_data: str = None):
+    def __init__(
+        self,
+        path: str,
+        cert_data: bytes,
+        key_data: Optional[bytes] = None,
+        file_signature: Optional[Tuple] = None,
+    ):
         self.path = path
         self.cert_data = cert_data
+        self.cert_sha256 = hashlib.sha256(cert_data).digest()
         self.key_data = key_data
-        self.expiration_date = None
-        self.domain_names = []
-        self.serial_number = None
+        # (mtime_ns, size) of the cert and key files this was loaded from
+        self.file_signature = file_signature
+        self.expiration_date: Optional[datetime] = None
+        self.domain_names: List[str] = []
+        self.serial_number: Optional[str] = None
 
         self._parse_certificate()
 
-    def _parse_certificate(self):
+    def _parse_certificate(self) -> None:
         """Parse certificate to extract metadata."""
         try:
-            cert = x509.load_pem_x509_certificate(
-                self.cert_data.encode(), default_backend()
-            )
+            # Saved files hold the certificate followed by its chain; parse the
+            # whole bundle in one pass and use the leaf
+            cert = x509.load_pem_x509_certificates(self.cert_data)[0]
 
-            self.expiration_date = cert.not_valid_after.replace(tzinfo=timezone.utc)
+            self.expiration_date = cert.not_valid_after_utc
             self.serial_number = str(cert.serial_number)
 
             # Extract domain names
             try:
                 # Get common name
-                for attribute in cert.subject:
-                    if attribute.oid == x509.NameOID.COMMON_NAME:
-                        self.domain_names.append(attribute.value)
-                        break
+                common_names = cert.subject.get_attributes_for_oid(x509.NameOID.COMMON_NAME)
+                if common_names:
+                    self.domain_names.append(str(common_names[0].value))
             except Exception:
                 pass
 
             # Get SAN (Subject Alternative Names)
             try:
-                san_ext = cert.extensions.get_extension_for_oid(
-                    x509.oid.ExtensionOID.SUBJECT_ALTERNATIVE_NAME
-                )
-                for name in san_ext.value:
-                    if isinstance(name, x509.DNSName):
-                        self.domain_names.append(name.value)
+                san_ext = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+                self.domain_names.extend(san_ext.value.get_values_for_type(x509.DNSName))
             except x509.ExtensionNotFound:
                 pass
 
-            # Remove duplicates
-            self.domain_names = list(set(self.domain_names))
+            # Remove duplicates, keeping the common name first
+            self.domain_names = list(dict.fromkeys(self.domain_names))
 
         except Exception as e:
             logger.error(f"Error parsing certificate {self.path}: {e}")
@@ -71,10 +89,13 @@ class CertificateInfo:
     @property
     def days_until_expiry(self) -> Optional[int]:
         """Calculate days until certificate expires."""
+        return self.days_until_expiry_at(datetime.now(timezone.utc))
+
+    def days_until_expiry_at(self, now: datetime) -> Optional[int]:
+        """Calculate days until certificate expires, as seen at now."""
         if not self.expiration_date:
             return None
 
-        now = datetime.now(timezone.utc)
         delta = self.expiration_date - now
         return delta.days
 
@@ -88,20 +109,36 @@ class CertificateInfo:
 class CertificateFileHandler(FileSystemEventHandler):
     """File system event handler for certificate changes."""
 
-    def __init__(self, monitor: "CertificateMonitor"):
+    def __init__(self, monitor: "CertificateMonitor") -> None:
         self.monitor = monitor
 
-    def on_modified(self, event):
+    def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
-        if not event.is_directory and self._is_cert_file(event.src_path):
-            logger.info(f"Certificate file modified: {event.src_path}")
-            self.monitor.on_certificate_changed(event.src_path)
+        path = os.fsdecode(event.src_path)
+        if not event.is_directory and self._is_cert_file(path):
+            logger.info(f"Certificate file modified: {path}")
+            self.monitor.on_certificate_changed(path)
 
-    def on_created(self, event):
+    def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events."""
-        if not event.is_directory and self._is_cert_file(event.src_path):
-            logger.info(f"Certificate file created: {event.src_path}")
-            self.monitor.on_certificate_changed(event.src_path)
+        path = os.fsdecode(event.src_path)
+        if not event.is_directory and self._is_cert_file(path):
+            logger.info(f"Certificate file created: {path}")
+            self.monitor.on_certificate_changed(path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle file move events (certificates are saved by renaming)."""
+        path = os.fsdecode(event.dest_path)
+        if not event.is_directory and self._is_cert_file(path):
+            logger.info(f"Certificate file replaced: {path}")
+            self.monitor.on_certificate_changed(path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        """Handle file deletion events."""
+        path = os.fsdecode(event.src_path)
+        if not event.is_directory and self._is_cert_file(path):
+            logger.info(f"Certificate file deleted: {path}")
+            self.monitor.on_certificate_changed(path)
 
     def _is_cert_file(self, path: str) -> bool:
         """Check if file is a certificate file."""
@@ -111,24 +148,67 @@ class CertificateFileHandler(FileSystemEventHandler):
 class CertificateMonitor:
     """Monitor local certificate files and manage certificate operations."""
 
-    def __init__(self):
-        self.cert_path = Path(settings.cert_path)
+    def __init__(self) -> None:
+        self.cert_path = settings.cert_path
         self.certificates: Dict[str, CertificateInfo] = {}
-        self.observer = None
-        self.change_callbacks = []
-
-    def start_monitoring(self):
-        """Start file system monitoring."""
+        # Lookup indexes over self.certificates: key -> {path: CertificateInfo},
+        # in load order, so a duplicate name falls back to another file when
+        # one is removed
+        self._by_domain: Dict[str, Dict[str, CertificateInfo]] = {}
+        self._by_serial: Dict[str, Dict[str, CertificateInfo]] = {}
+        # Certificate name ("<name>.pem" directly in cert_path) -> CertificateInfo
+        self._by_name: Dict[str, CertificateInfo] = {}
+        self._name_prefix = os.path.join(str(self.cert_path), "")
+        # Min-heap of (expiration_date, seq, path, CertificateInfo). Replaced
+        # and removed certificates leave stale entries behind, which are
+        # skipped and compacted away once they outnumber live ones
+        self._expiry_heap: List[Tuple[datetime, int, str, CertificateInfo]] = []
+        self._expiry_seq = itertools.count()
+        self._stale_expiry_entries = 0
+        # Certificates are loaded from pool threads
+        self._index_lock = threading.Lock()
+        # Paths saved or reported changed since the last drain_dirty()
+        self._dirty_paths: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self.observer: Optional[BaseObserver] = None
+        self.change_callbacks: List[Callable[[str], None]] = []
+        self._event_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._change_queue: Optional[asyncio.Queue] = None
+        self._change_consumer: Optional[asyncio.Task] = None
+
+    def start_monitoring(self) -> None:
+        """
+        Start file system monitoring.
+
+        Must be called from the event loop that should process changes.
+        """
         if self.observer:
             return
 
-        self.observer = Observer()
+        # Events arrive on the observer thread and are handed to a single
+        # consumer task on the event loop
+        self._event_loop = asyncio.get_running_loop()
+        self._change_queue = asyncio.Queue()
+        self._change_consumer = self._event_loop.create_task(
+            self._consume_changes(self._change_queue)
+        )
+
         handler = CertificateFileHandler(self)
-        self.observer.schedule(handler, str(self.cert_path), recursive=True)
-        self.observer.start()
+        observer: BaseObserver
+        try:
+            observer = Observer()
+            observer.schedule(handler, str(self.cert_path), recursive=True)
+            observer.start()
+        except OSError as e:
+            # e.g. inotify watch limit reached or an unsupported filesystem
+            logger.warning(f"Native file watching unavailable ({e}), falling back to polling")
+            observer = PollingObserver()
+            observer.schedule(handler, str(self.cert_path), recursive=True)
+            observer.start()
+        self.observer = observer
         logger.info(f"Started monitoring certificate directory: {self.cert_path}")
 
-    def stop_monitoring(self):
+    def stop_monitoring(self) -> None:
         """Stop file system monitoring."""
         if self.observer:
             self.observer.stop()
@@ -136,81 +216,328 @@ class CertificateMonitor:
             self.observer = None
             logger.info("Stopped certificate monitoring")
 
-    def add_change_callback(self, callback):
+        if self._change_consumer:
+            self._change_consumer.cancel()
+            self._change_consumer = None
+        self._change_queue = None
+        self._event_loop = None
+
+    def add_change_callback(self, callback: Callable[[str], None]) -> None:
         """Add callback for certificate changes."""
         self.change_callbacks.append(callback)
 
-    def on_certificate_changed(self, file_path: str):
-        """Handle certificate file changes."""
-        # Reload certificates
-        self.scan_certificates()
+    def on_certificate_changed(self, file_path: str) -> None:
+        """
+        Handle certificate file changes.
 
-        # Notify callbacks
-        for callback in self.change_callbacks:
-            try:
-                callback(file_path)
-            except Exception as e:
-                logger.error(f"Error in certificate change callback: {e}")
+        Called from the observer thread; the path is queued for the
+        consumer task on the event loop.
+        """
+        self.mark_dirty(file_path)
 
-    def scan_certificates(self) -> Dict[str, CertificateInfo]:
-        """Scan certificate directory and load all certificates."""
-        self.certificates.clear()
+        loop, queue = self._event_loop, self._change_queue
+        if not loop or queue is None or loop.is_closed():
+            logger.warning(f"Certificate monitoring not running, ignoring change: {file_path}")
+            return
 
+        loop.call_soon_threadsafe(queue.put_nowait, file_path)
+
+    async def _consume_changes(self, queue: asyncio.Queue) -> None:
+        """
+        Reload changed certificates and notify callbacks.
+
+        A single save usually fires several events, so after the first event
+        the consumer waits change_debounce_seconds and then handles every
+        distinct path queued in the meantime once.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            changed_paths = {await queue.get(): None}
+            await asyncio.sleep(settings.change_debounce_seconds)
+            while not queue.empty():
+                changed_paths[queue.get_nowait()] = None
+
+            # These paths are reloaded now, so a drain_dirty() rescan need not
+            # parse them again; events arriving during the reload mark them anew
+            self._clear_dirty(changed_paths)
+
+            # Reload only the certificates that changed
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(_LOAD_POOL, self.reload_certificate_file, file_path)
+                    for file_path in changed_paths
+                ),
+                return_exceptions=True,
+            )
+            for file_path, result in zip(changed_paths, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error reloading certificate {file_path}: {result}")
+
+            # Notify callbacks
+            for file_path in changed_paths:
+                for callback in self.change_callbacks:
+                    try:
+                        callback(file_path)
+                    except Exception as e:
+                        logger.error(f"Error in certificate change callback: {e}")
+
+    def reload_certificate_file(self, file_path: str) -> None:
+        """Reload a single certificate file, or forget it if it was removed."""
+        if not file_path.endswith(".pem"):
+            return
+
+        if os.path.exists(file_path):
+            self._load_certificate_file(file_path)
+        elif self._forget_certificate(file_path):
+            logger.info(f"Removed certificate: {file_path}")
+
+    def mark_dirty(self, file_path: str) -> None:
+        """Record that a certificate file may have changed."""
+        with self._dirty_lock:
+            self._dirty_paths.add(file_path)
+
+    def _clear_dirty(self, file_paths: Iterable[str]) -> None:
+        """Forget dirty marks for paths that are being reloaded."""
+        with self._dirty_lock:
+            self._dirty_paths.difference_update(file_paths)
+
+    def drain_dirty(self) -> Set[str]:
+        """Return and reset the paths changed since the last drain."""
+        with self._dirty_lock:
+            dirty, self._dirty_paths = self._dirty_paths, set()
+        return dirty
+
+    async def rescan_paths(self, paths: Iterable[str]) -> Dict[str, CertificateInfo]:
+        """Reload only the given certificate files, forgetting removed ones."""
+        loop = asyncio.get_running_loop()
+        paths = list(paths)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(_LOAD_POOL, self.reload_certificate_file, file_path)
+                for file_path in paths
+            ),
+            return_exceptions=True,
+        )
+        for file_path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error reloading certificate {file_path}: {result}")
+
+        return self.certificates
+
+    async def scan_certificates(self) -> Dict[str, CertificateInfo]:
+        """
+        Scan certificate directory and load all certificates.
+
+        Files are loaded concurrently in a thread pool; files whose
+        modification time and size are unchanged since the last scan are
+        not re-read or re-parsed.
+        """
         if not self.cert_path.exists():
             logger.warning(f"Certificate path does not exist: {self.cert_path}")
+            for path in list(self.certificates):
+                self._forget_certificate(path)
             return self.certificates
 
-        for cert_file in self.cert_path.glob("**/*.pem"):
-            try:
-                self._load_certificate_file(cert_file)
-            except Exception as e:
-                logger.error(f"Error loading certificate {cert_file}: {e}")
+        loop = asyncio.get_running_loop()
+        cert_files = list(self._iter_pem_files(str(self.cert_path)))
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(_LOAD_POOL, self._load_certificate_file, cert_file)
+                for cert_file in cert_files
+            ),
+            return_exceptions=True,
+        )
+
+        seen_paths = set(cert_files)
+        for cert_file, result in zip(cert_files, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading certificate {cert_file}: {result}")
+
+        # Forget certificates whose files are gone
+        for path in list(self.certificates):
+            if path not in seen_paths:
+                self._forget_certificate(path)
 
         logger.info(f"Loaded {len(self.certificates)} certificates")
         return self.certificates
 
-    def _load_certificate_file(self, cert_file: Path):
-        """Load a single certificate file."""
+    def _iter_pem_files(self, root: str) -> Iterator[str]:
+        """Recursively yield paths of .pem files below root."""
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    # Don't descend into symlinked directories to avoid loops,
+                    # but do follow symlinked files (e.g. mounted secrets)
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self._iter_pem_files(entry.path)
+                    elif entry.name.endswith(".pem") and entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logger.error(f"Error scanning certificate directory {root}: {e}")
+
+    def _file_signature(self, cert_file: str, key_file: str) -> Tuple:
+        """Get (mtime_ns, size) of a certificate and its key file, if any."""
+        cert_stat = os.stat(cert_file)
+        try:
+            key_stat = os.stat(key_file)
+            key_signature = (key_stat.st_mtime_ns, key_stat.st_size)
+        except FileNotFoundError:
+            key_signature = None
+        return (cert_stat.st_mtime_ns, cert_stat.st_size), key_signature
+
+    def _load_certificate_file(self, cert_file: str) -> None:
+        """Load a single certificate file, skipping it if unchanged."""
         try:
-            with open(cert_file, "r") as f:
+            # Try to find corresponding key file
+            key_file = os.path.splitext(cert_file)[0] + ".key"
+            signature = self._file_signature(cert_file, key_file)
+
+            cached = self.certificates.get(cert_file)
+            if cached and cached.file_signature == signature:
+                return
+
+            with open(cert_file, "rb") as f:
                 content = f.read()
 
-            # Try to find corresponding key file
-            key_file = cert_file.with_suffix(".key")
             key_data = None
-
-            if key_file.exists():
-                with open(key_file, "r") as f:
+            if signature[1] is not None:
+                with open(key_file, "rb") as f:
                     key_data = f.read()
 
-            cert_info = CertificateInfo(str(cert_file), content, key_data)
-            self.certificates[str(cert_file)] = cert_info
+            cert_info = CertificateInfo(cert_file, content, key_data, signature)
+            self._store_certificate(cert_info)
 
         except Exception as e:
             logger.error(f"Error loading certificate file {cert_file}: {e}")
 
+    @staticmethod
+    def _index_keys(cert_info: CertificateInfo) -> Tuple[List[str], List[str]]:
+        """Get the domain and serial index keys of a certificate."""
+        serials: List[str] = [cert_info.serial_number] if cert_info.serial_number else []
+        return cert_info.domain_names, serials
+
+    @staticmethod
+    def _update_index(
+        index: Dict[str, Dict[str, CertificateInfo]],
+        old_keys: List[str],
+        new_keys: List[str],
+        path: str,
+        cert_info: Optional[CertificateInfo],
+    ) -> None:
+        """Move a file's entries in an index from old_keys to new_keys."""
+        for key in set(old_keys).difference(new_keys):
+            entries = index.get(key)
+            if entries is not None:
+                entries.pop(path, None)
+                if not entries:
+                    del index[key]
+        if cert_info is not None:
+            for key in new_keys:
+                index.setdefault(key, {})[path] = cert_info
+
+    def _name_key(self, path: str) -> Optional[str]:
+        """Get the certificate name of a file saved by save_certificate, if it is one."""
+        if path.startswith(self._name_prefix) and path.endswith(".pem"):
+            name = path[len(self._name_prefix):-4]
+            if name and os.sep not in name:
+                return name
+        return None
+
+    def _store_certificate(self, cert_info: CertificateInfo) -> None:
+        """Add or replace a loaded certificate and update the indexes."""
+        with self._index_lock:
+            previous = self.certificates.get(cert_info.path)
+            old_domains, old_serials = self._index_keys(previous) if previous else ([], [])
+            new_domains, new_serials = self._index_keys(cert_info)
+
+            self.certificates[cert_info.path] = cert_info
+            self._update_index(self._by_domain, old_domains, new_domains, cert_info.path, cert_info)
+            self._update_index(self._by_serial, old_serials, new_serials, cert_info.path, cert_info)
+            name = self._name_key(cert_info.path)
+            if name:
+                self._by_name[name] = cert_info
+
+            if previous and previous.expiration_date:
+                self._expiry_entry_stale()
+            if cert_info.expiration_date:
+                heapq.heappush(
+                    self._expiry_heap,
+                    (cert_info.expiration_date, next(self._expiry_seq), cert_info.path, cert_info),
+                )
+
+    def _forget_certificate(self, path: str) -> Optional[CertificateInfo]:
+        """Remove a certificate and its index entries, returning it if known."""
+        with self._index_lock:
+            cert_info = self.certificates.pop(path, None)
+            if cert_info:
+                domains, serials = self._index_keys(cert_info)
+                self._update_index(self._by_domain, domains, [], path, None)
+                self._update_index(self._by_serial, serials, [], path, None)
+                name = self._name_key(path)
+                if name:
+                    self._by_name.pop(name, None)
+                if cert_info.expiration_date:
+                    self._expiry_entry_stale()
+            return cert_info
+
+    def _expiry_entry_stale(self) -> None:
+        """Count a stale expiry heap entry and compact the heap if needed."""
+        self._stale_expiry_entries += 1
+        if self._stale_expiry_entries > len(self.certificates):
+            self._expiry_heap = [
+                entry for entry in self._expiry_heap
+                if self.certificates.get(entry[2]) is entry[3]
+            ]
+            heapq.heapify(self._expiry_heap)
+            self._stale_expiry_entries = 0
+
+    @staticmethod
+    def write_file_atomic(path: str, data: str, mode: int = 0o644) -> None:
+        """
+        Write a file via a temporary file and rename.
+
+        Readers and the file watcher never see a partially written file, and
+        the permissions are set before the file appears under its final name.
+        """
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            # Apply the mode exactly, regardless of umask
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    @staticmethod
+    def certificate_file_content(cert_data: str, chain_data: Optional[str] = None) -> str:
+        """Build the .pem file content for a certificate and optional chain."""
+        if chain_data:
+            return f"{cert_data}\n{chain_data}"
+        return cert_data
+
     def save_certificate(
-        self, name: str, cert_data: str, key_data: str, chain_data: str = None
+        self, name: str, cert_data: str, key_data: str, chain_data: Optional[str] = None
     ) -> str:
         """Save certificate and key to filesystem."""
         cert_file = self.cert_path / f"{name}.pem"
         key_file = self.cert_path / f"{name}.key"
 
         try:
-            # Write certificate (with chain if provided)
-            with open(cert_file, "w") as f:
-                f.write(cert_data)
-                if chain_data:
-                    f.write("\n")
-                    f.write(chain_data)
+            # Write the key first so the certificate never appears without it
+            self.write_file_atomic(str(key_file), key_data)
 
-            # Write private key
-            with open(key_file, "w") as f:
-                f.write(key_data)
-
-            # Set appropriate permissions
-            os.chmod(cert_file, 0o644)
-            os.chmod(key_file, 0o644)
+            # Write certificate (with chain if provided)
+            self.write_file_atomic(
+                str(cert_file), self.certificate_file_content(cert_data, chain_data)
+            )
+            self.mark_dirty(str(cert_file))
 
             logger.info(f"Saved certificate: {cert_file}")
             return str(cert_file)
@@ -219,20 +546,51 @@ class CertificateMonitor:
             logger.error(f"Error saving certificate {name}: {e}")
             raise
 
+    def get_certificate_by_name(self, name: str) -> Optional[CertificateInfo]:
+        """Find the loaded certificate save_certificate writes for a name."""
+        with self._index_lock:
+            return self._by_name.get(name)
+
     def get_certificate_by_domain(self, domain: str) -> Optional[CertificateInfo]:
         """Find certificate by domain name."""
-        for cert_info in self.certificates.values():
-            if domain in cert_info.domain_names:
-                return cert_info
-        return None
+        with self._index_lock:
+            entries = self._by_domain.get(domain)
+            return next(iter(entries.values())) if entries else None
+
+    def get_certificate_by_serial(self, serial_number: str) -> Optional[CertificateInfo]:
+        """Find certificate by serial number."""
+        with self._index_lock:
+            entries = self._by_serial.get(serial_number)
+            return next(iter(entries.values())) if entries else None
 
     def get_expiring_certificates(
         self, days_threshold: int = 30
     ) -> List[CertificateInfo]:
-        """Get certificates expiring within threshold days."""
+        """
+        Get certificates expiring within threshold days, soonest first.
+
+        Only the part of the expiry heap before the cutoff is visited, so
+        the cost depends on the number of expiring certificates rather
+        than on the total.
+        """
+        # days_until_expiry <= threshold  <=>  expires before now + threshold + 1 days
+        cutoff = datetime.now(timezone.utc) + timedelta(days=days_threshold + 1)
+
         expiring = []
-        for cert_info in self.certificates.values():
-            days_left = cert_info.days_until_expiry
-            if days_left is not None and days_left <= days_threshold:
-                expiring.append(cert_info)
-        return expiring
+        with self._index_lock:
+            heap = self._expiry_heap
+            pending = [0]
+            while pending:
+                i = pending.pop()
+                if i >= len(heap):
+                    continue
+                expiration_date, seq, path, cert_info = heap[i]
+                if expiration_date >= cutoff:
+                    # Children of a heap node never expire earlier
+                    continue
+                if self.certificates.get(path) is cert_info:
+                    expiring.append((expiration_date, seq, cert_info))
+                pending.extend((2 * i + 1, 2 * i + 2))
+
+        expiring.sort(key=lambda entry: entry[:2])
+        return [cert_info for _, _, cert_info in expiring]
@@ -3,9 +3,14 @@ Configuration management for the certificate rotation service.
 """
 
 import os
-from typing import List, Optional
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, Any, Optional, Tuple
+
+from pydantic import Field, PrivateAttr, field_validator, model_validator, validator
+from pydantic_settings import BaseSettings, NoDecode
+
+VALID_LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
 
 
 class Settings(BaseSettings):
@@ -17,7 +22,7 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", description="Logging level")
     
     # Certificate management
-    cert_path: str = Field(..., description="Path where certificates are stored")
+    cert_path: Path = Field(..., description="Path where certificates are stored")
     secrets_names: str = Field(
         default="",
         description="Comma-separated list of AWS Secrets Manager secret names to monitor"
@@ -32,15 +37,69 @@ class Settings(BaseSettings):
         default=None,
         description="Tag value to filter secrets by"
     )
+    certificate_tag_key: Optional[str] = Field(
+        default=None,
+        description="Tag key marking certificate secrets; explicitly named secrets without it are skipped"
+    )
+    certificate_tag_value: Optional[str] = Field(
+        default=None,
+        description="Tag value marking certificate secrets, used with certificate_tag_key"
+    )
+    secrets_metadata_cache_ttl_seconds: int = Field(
+        default=60,
+        description="How long Secrets Manager secret metadata and listings are cached"
+    )
 
     # AWS configuration
     aws_region: str = Field(default="us-east-1", description="AWS region")
+    aws_max_pool_connections: int = Field(
+        default=64,
+        description="Maximum number of pooled HTTPS connections per AWS client"
+    )
+    aws_retry_mode: str = Field(
+        default="adaptive",
+        description="botocore retry mode (legacy, standard or adaptive)"
+    )
+    aws_max_attempts: int = Field(
+        default=10,
+        description="Maximum number of attempts for a single AWS API call"
+    )
+    
+    # ACM configuration
+    acm_cert_arns: Annotated[Tuple[str, ...], NoDecode] = Field(
+        default=(),
+        description="Comma-separated list of ACM certificate ARNs to monitor"
+    )
+    acm_passphrase: Optional[str] = Field(
+        default=None,
+        description="Passphrase used to export imported ACM certificates"
+    )
+    acm_cache_ttl_seconds: int = Field(
+        default=300,
+        description="How long ACM certificate metadata and tags are cached"
+    )
     
     # Scheduling configuration
     check_interval_minutes: int = Field(
         default=60,
         description="Interval in minutes to check for certificate updates"
     )
+    full_scan_interval_minutes: int = Field(
+        default=60,
+        description="Interval in minutes to rescan the whole certificate directory"
+    )
+    max_concurrent_syncs: int = Field(
+        default=8,
+        description="Maximum number of certificates synchronized concurrently"
+    )
+    reload_debounce_seconds: float = Field(
+        default=0.5,
+        description="Delay before reloading HAProxy after certificate file changes, coalescing bursts"
+    )
+    change_debounce_seconds: float = Field(
+        default=0.25,
+        description="Quiet period before a burst of certificate file events is processed"
+    )
     
     # HAProxy configuration
     haproxy_reload_url: Optional[str] = Field(
@@ -59,21 +118,38 @@ class Settings(BaseSettings):
     # Metrics configuration
     metrics_enabled: bool = Field(default=True, description="Enable Prometheus metrics")
     
+    _secrets_names_list: Tuple[str, ...] = PrivateAttr(default=())
+
     @property
-    def secrets_names_list(self) -> List[str]:
-        """Get Secrets Manager secret names as a list."""
-        if not self.secrets_names:
-            return []
-        return [name.strip() for name in self.secrets_names.split(',') if name.strip()]
+    def secrets_names_list(self) -> Tuple[str, ...]:
+        """Get Secrets Manager secret names, parsed once at load time."""
+        return self._secrets_names_list
+
+    @model_validator(mode='after')
+    def parse_secrets_names(self) -> 'Settings':
+        """Split the comma-separated secret names into a tuple."""
+        self._secrets_names_list = tuple(
+            name.strip() for name in self.secrets_names.split(',') if name.strip()
+        )
+        return self
+
+    @field_validator('acm_cert_arns', mode='before')
+    @classmethod
+    def parse_acm_cert_arns(cls, v: Any) -> Any:
+        """Split a comma-separated ARN string into a tuple."""
+        if isinstance(v, str):
+            return tuple(arn.strip() for arn in v.split(',') if arn.strip())
+        return v
     
     @validator('cert_path')
-    def validate_cert_path(cls, v):
+    def validate_cert_path(cls, v: Path) -> Path:
         """Ensure certificate path exists and is writable."""
-        if not os.path.exists(v):
-            try:
-                os.makedirs(v, exist_ok=True)
-            except Exception as e:
-                raise ValueError(f"Cannot create certificate path {v}: {e}")
+        # makedirs is a no-op for an existing directory, so there is no
+        # separate existence check to race with
+        try:
+            os.makedirs(v, exist_ok=True)
+        except OSError as e:
+            raise ValueError(f"Cannot create certificate path {v}: {e}")
         
         if not os.access(v, os.W_OK):
             raise ValueError(f"Certificate path {v} is not writable")
@@ -81,11 +157,10 @@ class Settings(BaseSettings):
         return v
     
     @validator('log_level')
-    def validate_log_level(cls, v):
+    def validate_log_level(cls, v: str) -> str:
         """Validate log level."""
-        valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        if v.upper() not in valid_levels:
-            raise ValueError(f"Invalid log level. Must be one of: {valid_levels}")
+        if v.upper() not in VALID_LOG_LEVELS:
+            raise ValueError(f"Invalid log level. Must be one of: {list(VALID_LOG_LEVELS)}")
         return v.upper()
     
     class Config:
@@ -93,5 +168,11 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the process-wide settings, loading and validating them once."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
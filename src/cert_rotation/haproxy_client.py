@@ -2,25 +2,30 @@
 HAProxy integration for certificate reload operations.
 """
 
+import asyncio
 import logging
-import socket
 from typing import Optional
 
 import httpx
 
-from .config import settings
+from .config import get_settings
 from .metrics import metrics_collector
 
+settings = get_settings()
+
 logger = logging.getLogger(__name__)
 
 
 class HAProxyClient:
     """Client for interacting with HAProxy."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self.reload_url = settings.haproxy_reload_url
         self.stats_socket = settings.haproxy_stats_socket
         self.container_name = settings.haproxy_container_name
+        # Created on first use, inside the running event loop, and kept open
+        # so reloads reuse pooled keep-alive connections until aclose()
+        self._http: Optional[httpx.AsyncClient] = None
         logger.info(
             f"HAProxy client initialized with {self.reload_url=}, {self.stats_socket=}, {self.container_name=}"
         )
@@ -41,7 +46,7 @@ class HAProxyClient:
 
         # Try HTTP reload first
         if self.reload_url:
-            success = await self._reload_via_http()
+            success = await self._reload_via_http(self.reload_url)
             if success:
                 logger.info("HAProxy reload successful via HTTP")
                 metrics_collector.record_haproxy_reload(True)
@@ -73,20 +78,19 @@ class HAProxyClient:
         metrics_collector.record_haproxy_reload(False)
         return False
 
-    async def _reload_via_http(self) -> bool:
+    async def _reload_via_http(self, url: str) -> bool:
         """Reload HAProxy via HTTP endpoint."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(self.reload_url)
+            response = await self._get_http().post(url)
 
-                if response.status_code == 200:
-                    logger.debug(f"HAProxy HTTP reload response: {response.text}")
-                    return True
-                else:
-                    logger.error(
-                        f"HAProxy HTTP reload failed: {response.status_code} - {response.text}"
-                    )
-                    return False
+            if response.status_code == 200:
+                logger.debug(f"HAProxy HTTP reload response: {response.text}")
+                return True
+            else:
+                logger.error(
+                    f"HAProxy HTTP reload failed: {response.status_code} - {response.text}"
+                )
+                return False
 
         except httpx.TimeoutException:
             logger.error("HAProxy HTTP reload timed out")
@@ -95,32 +99,63 @@ class HAProxyClient:
             logger.error(f"HAProxy HTTP reload error: {e}")
             return False
 
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, creating it if needed."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                # Fail fast on an unreachable HAProxy, but allow the reload itself time
+                timeout=httpx.Timeout(connect=2.0, read=10.0, write=5.0, pool=1.0),
+                limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=60.0),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections; a later reload opens new ones."""
+        http, self._http = self._http, None
+        if http is not None:
+            await http.aclose()
+
+    async def _send_socket_command(self, command: str, timeout: float) -> bytes:
+        """
+        Send a single command to the HAProxy stats socket and return the raw response.
+
+        Uses asyncio streams so a slow socket doesn't block the event loop;
+        timeout applies to connecting and to reading the response separately.
+        """
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(self.stats_socket), timeout=timeout
+        )
+        try:
+            writer.write(command.encode())
+            await writer.drain()
+
+            # HAProxy closes the connection after answering a single command
+            data = await asyncio.wait_for(reader.read(), timeout=timeout)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        return data
+
     async def _reload_via_socket(self) -> bool:
         """Reload HAProxy via stats socket."""
         try:
-            # Connect to HAProxy stats socket
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(10.0)
-            sock.connect(self.stats_socket)
-
             # Send reload command
             # Note: HAProxy doesn't have a direct "reload certs" command
             # We'll use "show ssl cert" to trigger cert refresh
             # In practice, you might need to use external reload mechanism
-            command = "show ssl cert\n"
-            sock.send(command.encode())
+            response = await self._send_socket_command("show ssl cert\n", timeout=10.0)
 
-            # Read response
-            response = sock.recv(4096).decode()
-            sock.close()
-
-            logger.debug(f"HAProxy socket response: {response}")
+            logger.debug(f"HAProxy socket response: {response.decode(errors='replace')}")
 
             # For demonstration, we'll consider any response as success
             # In real implementation, you'd parse the response
             return True
 
-        except socket.timeout:
+        except asyncio.TimeoutError:
             logger.error("HAProxy stats socket connection timed out")
             return False
         except FileNotFoundError:
@@ -136,25 +171,15 @@ class HAProxyClient:
             return None
 
         try:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(5.0)
-            sock.connect(self.stats_socket)
-
             # Get basic info
-            command = "show info\n"
-            sock.send(command.encode())
-
-            response = sock.recv(8192).decode()
-            sock.close()
+            response = await self._send_socket_command("show info\n", timeout=5.0)
 
-            # Parse response into dict
-            info = {}
-            for line in response.split("\n"):
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    info[key.strip()] = value.strip()
-
-            return info
+            # Parse "key: value" lines into dict, decoding only the kept fields
+            return {
+                key.strip().decode(errors="replace"): value.strip().decode(errors="replace")
+                for key, sep, value in (line.partition(b":") for line in response.splitlines())
+                if sep
+            }
 
         except Exception as e:
             logger.error(f"Error getting HAProxy status: {e}")
@@ -194,29 +219,20 @@ class HAProxyClient:
             return None
 
         try:
-            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.settimeout(5.0)
-            sock.connect(self.stats_socket)
-
             # Get SSL cert info
-            command = "show ssl cert\n"
-            sock.send(command.encode())
-
-            response = sock.recv(8192).decode()
-            sock.close()
-
-            # Parse certificate information
-            certs = []
-            for line in response.split("\n"):
-                if line.strip() and not line.startswith("#"):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        certs.append(
-                            {
-                                "filename": parts[0],
-                                "status": parts[1] if len(parts) > 1 else "unknown",
-                            }
-                        )
+            response = await self._send_socket_command("show ssl cert\n", timeout=5.0)
+
+            # Parse certificate information: "<filename> <status> ..." per line
+            certs = [
+                {
+                    "filename": parts[0].decode(errors="replace"),
+                    "status": parts[1].decode(errors="replace"),
+                }
+                for line in response.splitlines()
+                if not line.startswith(b"#")
+                for parts in (line.split(None, 2),)
+                if len(parts) >= 2
+            ]
 
             return {"certificates": certs}
 
@@ -2,31 +2,51 @@
 Main FastAPI application for certificate rotation service.
 """
 
+import asyncio
+import json
 import logging
 from contextlib import asynccontextmanager
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, Response
 
-from .config import settings
+from .config import get_settings
+from .haproxy_client import haproxy_client
 from .metrics import generate_metrics
 from .scheduler import CertificateScheduler
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+settings = get_settings()
+
+# Configure logging, unless the embedding application already has
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        # Already validated and upper-cased by Settings
+        level=logging.getLevelNamesMapping()[settings.log_level],
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
 logger = logging.getLogger(__name__)
 
+# /health is hit by load balancer probes and never changes, so its body is
+# encoded once
+HEALTH_RESPONSE_BODY = json.dumps(
+    {"status": "healthy", "service": "cert-rotation", "version": "0.1.0"}
+).encode()
+
 # Global scheduler instance
-scheduler: CertificateScheduler = None
+scheduler: Optional[CertificateScheduler] = None
+
+
+def get_scheduler() -> CertificateScheduler:
+    """Endpoint dependency returning the running scheduler."""
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    return scheduler
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan manager."""
     global scheduler
 
@@ -44,6 +64,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down certificate rotation service")
     if scheduler:
         await scheduler.stop()
+    await haproxy_client.aclose()
     logger.info("Certificate rotation service stopped")
 
 
@@ -56,10 +77,18 @@ app = FastAPI(
 )
 
 
-@app.get("/health")
-async def health_check() -> Dict[str, Any]:
+def _strip_to_metadata(secrets_data: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Drop secret content, keeping only each secret's _metadata."""
+    return {
+        name: {"_metadata": data.get("_metadata", {})}
+        for name, data in secrets_data.items()
+    }
+
+
+@app.get("/health", response_model=Dict[str, Any])
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy", "service": "cert-rotation", "version": "0.1.0"}
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
 
 
 @app.get("/metrics", response_class=PlainTextResponse)
@@ -72,13 +101,10 @@ async def metrics() -> str:
 
 
 @app.post("/reload")
-async def manual_reload() -> Dict[str, str]:
+async def manual_reload(
+    scheduler: CertificateScheduler = Depends(get_scheduler),
+) -> Dict[str, str]:
     """Manually trigger certificate reload."""
-    global scheduler
-
-    if not scheduler:
-        raise HTTPException(status_code=503, detail="Scheduler not initialized")
-
     try:
         await scheduler.sync_certificates()
         return {"status": "success", "message": "Certificate sync triggered"}
@@ -90,8 +116,6 @@ async def manual_reload() -> Dict[str, str]:
 @app.get("/status")
 async def service_status() -> Dict[str, Any]:
     """Get service status and statistics."""
-    global scheduler
-
     if not scheduler:
         return {"status": "initializing"}
 
@@ -99,42 +123,42 @@ async def service_status() -> Dict[str, Any]:
 
 
 @app.get("/status/list_secrets")
-async def list_secrets(include_tags: bool = False) -> Dict[str, Any]:
+async def list_secrets(
+    include_tags: bool = False,
+    scheduler: CertificateScheduler = Depends(get_scheduler),
+) -> Dict[str, Any]:
     """List all certificate secrets from AWS Secrets Manager."""
-    global scheduler
-
-    if not scheduler:
-        raise HTTPException(status_code=503, detail="Scheduler not initialized")
-
     try:
-        # Get all secrets from Secrets Manager (metadata only)
-        all_secrets = await scheduler.secrets_client.list_secrets(
-            include_tags=include_tags
-        )
         # TODO: rewrite this if. It should incopsulated into secrets client. Same for scheduler
+        tag_based = bool(settings.tag_key and settings.tag_value)
+        if tag_based:
+            monitored_request = scheduler.secrets_client.get_secrets_by_env_tag(
+                include_tags=include_tags
+            )
+        else:
+            monitored_request = scheduler.secrets_client.get_monitored_secrets_metadata(
+                include_tags=include_tags
+            )
+
+        # All secrets (metadata only) and the monitored ones are independent
+        # AWS calls, so fetch them concurrently
+        all_secrets, monitored_data = await asyncio.gather(
+            scheduler.secrets_client.list_secrets(include_tags=include_tags),
+            monitored_request,
+        )
 
         # Get monitored secrets based on current configuration
-        if settings.tag_key and settings.tag_value:
+        if tag_based:
             # Tag-based discovery
-            tag_secrets_data = await scheduler.secrets_client.get_secrets_by_env_tag(
-                include_tags=include_tags
-            )
-            monitored_secrets = {
-                name: {"_metadata": data.get("_metadata", {})}
-                for name, data in tag_secrets_data.items()
-            }
+            monitored_secrets = _strip_to_metadata(monitored_data)
             discovery_method = "tag-based"
-            discovery_config = {
+            discovery_config: Dict[str, Any] = {
                 "tag_key": settings.tag_key,
                 "tag_value": settings.tag_value,
             }
         else:
             # Explicit secret names
-            monitored_secrets = (
-                await scheduler.secrets_client.get_monitored_secrets_metadata(
-                    include_tags=include_tags
-                )
-            )
+            monitored_secrets = monitored_data
             discovery_method = "explicit"
             discovery_config = {"monitored_secret_names": settings.secrets_names_list}
 
@@ -155,14 +179,12 @@ async def list_secrets(include_tags: bool = False) -> Dict[str, Any]:
 
 @app.get("/status/secrets_by_tag")
 async def list_secrets_by_tag(
-    tag_key: str, tag_value: str, include_tags: bool = True
+    tag_key: str,
+    tag_value: str,
+    include_tags: bool = True,
+    scheduler: CertificateScheduler = Depends(get_scheduler),
 ) -> Dict[str, Any]:
     """List secrets filtered by a specific tag key/value pair."""
-    global scheduler
-
-    if not scheduler:
-        raise HTTPException(status_code=503, detail="Scheduler not initialized")
-
     try:
         # Get secrets by the specified tag
         secrets_data = await scheduler.secrets_client.get_secrets_by_tag(
@@ -170,9 +192,7 @@ async def list_secrets_by_tag(
         )
 
         # Convert to metadata-only format for the response
-        secrets_metadata = {}
-        for name, data in secrets_data.items():
-            secrets_metadata[name] = {"_metadata": data.get("_metadata", {})}
+        secrets_metadata = _strip_to_metadata(secrets_data)
 
         return {
             "tag_filter": {"key": tag_key, "value": tag_value},
@@ -188,19 +208,21 @@ async def list_secrets_by_tag(
         )
 
 
+def _mask(value: str) -> str:
+    """Shorten a PEM value to its first and last 50 characters."""
+    return value if len(value) <= 100 else f"{value[:50]}...{value[-50:]}"
+
+
 @app.get("/debug/secret/{secret_name}")
 async def get_secret_debug_info(
-    secret_name: str, include_content: bool = False
+    secret_name: str,
+    include_content: bool = False,
+    scheduler: CertificateScheduler = Depends(get_scheduler),
 ) -> Dict[str, Any]:
     """
     Get detailed secret information for debugging.
     WARNING: Use include_content=true only for debugging - it exposes certificate data!
     """
-    global scheduler
-
-    if not scheduler:
-        raise HTTPException(status_code=503, detail="Scheduler not initialized")
-
     try:
         if include_content:
             # Get full secret data (including sensitive content)
@@ -212,32 +234,30 @@ async def get_secret_debug_info(
                     status_code=404, detail=f"Secret {secret_name} not found"
                 )
 
-            # Mask sensitive data partially for logs
-            masked_data = secret_data.copy()
-            if "certificate" in masked_data:
-                cert = masked_data["certificate"]
-                masked_data["certificate"] = (
-                    cert[:50] + "..." + cert[-50:] if len(cert) > 100 else cert
-                )
-            if "private_key" in masked_data:
-                key = masked_data["private_key"]
-                masked_data["private_key"] = (
-                    key[:50] + "..." + key[-50:] if len(key) > 100 else key
-                )
+            # Mask sensitive data partially, in a copy so the client's
+            # result is never modified
+            masked_data = {
+                **secret_data,
+                **{
+                    field: _mask(secret_data[field])
+                    for field in ("certificate", "private_key")
+                    if field in secret_data
+                },
+            }
 
             return {
                 "secret_name": secret_name,
-                "content": secret_data,
+                "content": masked_data,
                 "warning": "This response contains sensitive certificate data!",
             }
         else:
-            # Get only metadata
-            metadata_response = (
-                await scheduler.secrets_client.get_monitored_secrets_metadata(
-                    include_tags=True
+            # Get only metadata, for this secret alone; only monitored
+            # secrets are described
+            secret_metadata = None
+            if secret_name in settings.secrets_names_list:
+                secret_metadata = await scheduler.secrets_client.describe_secret(
+                    secret_name, include_tags=True
                 )
-            )
-            secret_metadata = metadata_response.get(secret_name)
 
             if not secret_metadata:
                 raise HTTPException(
@@ -260,7 +280,7 @@ async def get_secret_debug_info(
         )
 
 
-def main():
+def main() -> None:
     """Main entry point."""
     logger.info(f"Starting server on {settings.host}:{settings.port}")
     uvicorn.run(
@@ -269,6 +289,9 @@ def main():
         port=settings.port,
         log_level=settings.log_level.lower(),
         reload=False,
+        # uvloop and httptools come with uvicorn[standard]
+        loop="uvloop",
+        http="httptools",
     )
 
 
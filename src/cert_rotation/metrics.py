@@ -3,33 +3,25 @@ Prometheus metrics for certificate rotation service.
 """
 
 import time
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
 from prometheus_client import (
-    CollectorRegistry, 
-    Gauge, 
-    Counter, 
+    CollectorRegistry,
+    Counter,
+    Gauge,
     Histogram,
-    generate_latest
+    generate_latest,
 )
 
-from .config import settings
-
-
 # Create a custom registry
 metrics_registry = CollectorRegistry()
 
-# Certificate expiration metrics
+# Certificate expiration metrics; negative once a certificate has expired
 cert_expiry_days = Gauge(
     'cert_expiry_days',
     'Days until certificate expires',
-    ['cert_path', 'domain'],
-    registry=metrics_registry
-)
-
-cert_expired = Gauge(
-    'cert_expired',
-    'Certificate is expired (1) or not (0)',
-    ['cert_path', 'domain'],
+    ['domain'],
     registry=metrics_registry
 )
 
@@ -44,6 +36,8 @@ sync_operations_total = Counter(
 sync_duration_seconds = Histogram(
     'cert_sync_duration_seconds',
     'Time spent syncing certificates',
+    # Syncs take seconds to minutes; fewer buckets keep the scrape payload small
+    buckets=(0.1, 1, 5, 15, 60, 300, float('inf')),
     registry=metrics_registry
 )
 
@@ -85,63 +79,98 @@ file_changes_total = Counter(
 class MetricsCollector:
     """Collect and update metrics."""
     
-    def __init__(self):
-        self.start_time = time.time()
+    def __init__(self) -> None:
+        # Monotonic, only used to compute uptime
+        self.start_time = time.monotonic()
+        # domain -> cert_expiry_days label child currently exported; reusing
+        # them skips the labels() lookup under the metric lock
+        self._cert_children: Dict[str, Gauge] = {}
+        # Values mirrored from the metrics above for the status endpoint
+        self._snapshot: Dict[str, Any] = {
+            'certificates_managed': 0,
+            'last_sync_timestamp': 0.0,
+            'sync_operations': {'success': 0, 'failure': 0},
+        }
     
-    def update_certificate_metrics(self, certificates: Dict[str, Any]):
-        """Update certificate-related metrics."""
-        # Clear existing metrics
-        cert_expiry_days.clear()
-        cert_expired.clear()
-        
-        cert_count = 0
-        for cert_path, cert_info in certificates.items():
-            cert_count += 1
-            
+    def update_certificate_metrics(self, certificates: Dict[str, Any], now: Optional[datetime] = None) -> None:
+        """
+        Update certificate-related metrics.
+
+        Certificate gauges are labelled by primary domain only, so rotating
+        or renaming a file doesn't create new time series. If several files
+        share a primary domain, the one expiring soonest is reported.
+        Expiry is computed against a single now for all certificates.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        expiry_by_domain: Dict[str, int] = {}
+        for cert_info in certificates.values():
+            days_left = cert_info.days_until_expiry_at(now)
+            if days_left is None:
+                continue
+
             # Get primary domain for labeling
             primary_domain = cert_info.domain_names[0] if cert_info.domain_names else 'unknown'
-            
-            # Update expiry metrics
-            if cert_info.days_until_expiry is not None:
-                cert_expiry_days.labels(
-                    cert_path=cert_path,
-                    domain=primary_domain
-                ).set(cert_info.days_until_expiry)
-                
-                cert_expired.labels(
-                    cert_path=cert_path,
-                    domain=primary_domain
-                ).set(1 if cert_info.is_expired else 0)
+            if primary_domain not in expiry_by_domain or days_left < expiry_by_domain[primary_domain]:
+                expiry_by_domain[primary_domain] = days_left
+
+        # Update expiry metrics
+        children = self._cert_children
+        for domain, days_left in expiry_by_domain.items():
+            expiry_child = children.get(domain)
+            if expiry_child is None:
+                expiry_child = children[domain] = cert_expiry_days.labels(domain=domain)
+            expiry_child.set(days_left)
+
+        # Drop series only for domains that are gone
+        for domain in children.keys() - expiry_by_domain.keys():
+            cert_expiry_days.remove(domain)
+            del children[domain]
         
-        certificates_managed.set(cert_count)
+        certificates_managed.set(len(certificates))
+        self._snapshot['certificates_managed'] = len(certificates)
     
-    def record_sync_operation(self, success: bool, duration: float = None):
-        """Record a sync operation."""
+    def record_sync_operation(
+        self, success: bool, duration: Optional[float] = None, wall_now: Optional[float] = None
+    ) -> None:
+        """
+        Record a sync operation.
+
+        Args:
+            success: Whether the sync succeeded
+            duration: Sync duration in seconds, from a monotonic clock
+            wall_now: Wall-clock time of the sync; defaults to time.time()
+        """
         status = 'success' if success else 'failure'
         sync_operations_total.labels(status=status).inc()
+        self._snapshot['sync_operations'][status] += 1
         
         if success:
-            last_sync_timestamp.set(time.time())
+            if wall_now is None:
+                wall_now = time.time()
+            last_sync_timestamp.set(wall_now)
+            self._snapshot['last_sync_timestamp'] = wall_now
         
         if duration is not None:
             sync_duration_seconds.observe(duration)
     
-    def record_secrets_request(self, operation: str, success: bool):
+    def record_secrets_request(self, operation: str, success: bool) -> None:
         """Record a Secrets Manager API request."""
         status = 'success' if success else 'failure'
         secrets_requests_total.labels(operation=operation, status=status).inc()
 
     # Keep the old method name for backward compatibility during transition
-    def record_acm_request(self, operation: str, success: bool):
+    def record_acm_request(self, operation: str, success: bool) -> None:
         """Record a Secrets Manager API request (legacy method name)."""
         self.record_secrets_request(operation, success)
     
-    def record_haproxy_reload(self, success: bool):
+    def record_haproxy_reload(self, success: bool) -> None:
         """Record a HAProxy reload attempt."""
         status = 'success' if success else 'failure'
         haproxy_reload_total.labels(status=status).inc()
     
-    def record_file_change(self, change_type: str):
+    def record_file_change(self, change_type: str) -> None:
         """Record a file system change."""
         file_changes_total.labels(change_type=change_type).inc()
 
@@ -150,22 +179,32 @@ class MetricsCollector:
 metrics_collector = MetricsCollector()
 
 
+# Rendered metrics output is reused for this long, so concurrent or
+# back-to-back scrapes don't each rebuild the exposition text
+METRICS_CACHE_TTL_SECONDS = 1.0
+# (monotonic time generated, exposition text)
+_metrics_cache: Tuple[float, str] = (0.0, '')
+
+
 def generate_metrics() -> str:
-    """Generate Prometheus metrics output."""
-    return generate_latest(metrics_registry).decode('utf-8')
+    """Generate Prometheus metrics output, cached for METRICS_CACHE_TTL_SECONDS."""
+    global _metrics_cache
+    now = time.monotonic()
+    generated_at, body = _metrics_cache
+    if not body or now - generated_at >= METRICS_CACHE_TTL_SECONDS:
+        body = generate_latest(metrics_registry).decode('utf-8')
+        _metrics_cache = (now, body)
+    return body
 
 
 def get_metrics_summary() -> Dict[str, Any]:
     """Get a summary of current metrics for status endpoint."""
+    snapshot = metrics_collector._snapshot
     return {
-        'certificates_managed': certificates_managed._value._value,
-        'last_sync_timestamp': last_sync_timestamp._value._value,
+        'certificates_managed': snapshot['certificates_managed'],
+        'last_sync_timestamp': snapshot['last_sync_timestamp'],
         'sync_operations_total': {
-            family.name: {
-                sample.labels['status']: sample.value 
-                for sample in family.samples
-            }
-            for family in sync_operations_total.collect()
+            'cert_sync_operations': dict(snapshot['sync_operations'])
         },
-        'service_uptime_seconds': time.time() - metrics_collector.start_time
+        'service_uptime_seconds': time.monotonic() - metrics_collector.start_time
     }
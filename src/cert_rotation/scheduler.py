@@ -3,38 +3,113 @@ Background scheduler for certificate synchronization tasks.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 import time
-from typing import Dict, Any, Set
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
-from .config import settings
-from .secrets_client import SecretsManagerClient
 from .cert_monitor import CertificateMonitor
+from .config import get_settings
 from .haproxy_client import haproxy_client
 from .metrics import metrics_collector
+from .secrets_client import SecretsManagerClient, parse_datetime
+
+settings = get_settings()
 
 
 logger = logging.getLogger(__name__)
 
+# Per-secret record of what was last written, kept next to the certificates
+SYNC_STATE_FILE = ".sync_state.json"
+
+# Number of recent sync errors kept for the status endpoint
+MAX_SYNC_ERRORS = 64
+
 
 class CertificateScheduler:
     """Background scheduler for certificate operations."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.scheduler = AsyncIOScheduler()
         self.secrets_client = SecretsManagerClient()
         self.cert_monitor = CertificateMonitor()
         self.is_running = False
         self.sync_in_progress = False
-        self.last_sync_time = None
-        self.sync_errors = []
-        self.event_loop = None  # Store reference to the main event loop
+        # Wall-clock time.time() of the last successful sync
+        self.last_sync_wall: Optional[float] = None
+        self.sync_errors: Deque[str] = deque(maxlen=MAX_SYNC_ERRORS)
+        self.event_loop: Optional[asyncio.AbstractEventLoop] = None  # Store reference to the main event loop
+        # Pending HAProxy reload request from file changes; holding at most one
+        # coalesces a burst of changes into a single reload
+        self._reload_requests: Optional[asyncio.Queue] = None
+        self._reload_consumer: Optional[asyncio.Task] = None
+        # secret name -> {'version_id', 'cert_sha256', 'last_changed'} of the last sync
+        self._sync_state: Dict[str, Dict[str, str]] = self._load_sync_state()
+        self._sync_state_dirty = False
+        # Parsed 'last_changed' of each sync state entry
+        self._synced_changes: Dict[str, datetime] = {
+            name: changed
+            for name, state in self._sync_state.items()
+            if (changed := parse_datetime(state.get('last_changed')))
+        }
+
+    @property
+    def _sync_state_path(self) -> Path:
+        return self.cert_monitor.cert_path / SYNC_STATE_FILE
+
+    def _load_sync_state(self) -> Dict[str, Dict[str, str]]:
+        """Load the sync state file, starting empty if it is missing or unreadable."""
+        try:
+            with open(self._sync_state_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state {self._sync_state_path}: {e}")
+            return {}
+
+        if not isinstance(state, dict) or not all(isinstance(entry, dict) for entry in state.values()):
+            logger.warning(f"Ignoring malformed sync state {self._sync_state_path}")
+            return {}
+        return state
+
+    def _save_sync_state(self) -> None:
+        """Persist the sync state if it changed."""
+        if not self._sync_state_dirty:
+            return
+        try:
+            self.cert_monitor.write_file_atomic(
+                str(self._sync_state_path), json.dumps(self._sync_state, indent=2, sort_keys=True)
+            )
+            self._sync_state_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save sync state {self._sync_state_path}: {e}")
+
+    def _record_synced(self, secret_name: str, secret_data: Dict, cert_sha256: bytes) -> None:
+        """Remember the secret version and certificate file hash now on disk."""
+        metadata = secret_data.get('_metadata', {})
+        last_changed = parse_datetime(metadata.get('last_changed_date'))
+        state = {
+            'version_id': metadata.get('version_id'),
+            'cert_sha256': cert_sha256.hex(),
+            'last_changed': last_changed.isoformat() if last_changed else None,
+        }
+        if self._sync_state.get(secret_name) != state:
+            self._sync_state[secret_name] = state
+            self._sync_state_dirty = True
+            if last_changed:
+                self._synced_changes[secret_name] = last_changed
+            else:
+                self._synced_changes.pop(secret_name, None)
     
-    async def start(self):
+    async def start(self) -> None:
         """Start the scheduler and monitoring."""
         if self.is_running:
             return
@@ -43,6 +118,10 @@ class CertificateScheduler:
 
         # Store reference to the current event loop
         self.event_loop = asyncio.get_running_loop()
+        self._reload_requests = asyncio.Queue(maxsize=1)
+        self._reload_consumer = asyncio.create_task(
+            self._consume_reload_requests(self._reload_requests)
+        )
 
         # Start certificate monitoring
         self.cert_monitor.start_monitoring()
@@ -60,6 +139,17 @@ class CertificateScheduler:
             max_instances=1,
             coalesce=True
         )
+
+        # File events only reload the files they name; periodically rescan
+        # the whole directory to catch anything the watcher missed
+        self.scheduler.add_job(
+            self._rescan_certificates,
+            trigger=IntervalTrigger(minutes=settings.full_scan_interval_minutes),
+            id='cert_rescan',
+            name='Certificate Directory Rescan',
+            max_instances=1,
+            coalesce=True
+        )
         
         # Start scheduler
         self.scheduler.start()
@@ -67,7 +157,7 @@ class CertificateScheduler:
         
         logger.info(f"Certificate scheduler started with {settings.check_interval_minutes}min interval")
     
-    async def stop(self):
+    async def stop(self) -> None:
         """Stop the scheduler and monitoring."""
         if not self.is_running:
             return
@@ -80,16 +170,24 @@ class CertificateScheduler:
         # Stop monitoring
         self.cert_monitor.stop_monitoring()
 
+        if self._reload_consumer:
+            self._reload_consumer.cancel()
+            try:
+                await self._reload_consumer
+            except asyncio.CancelledError:
+                pass
+            self._reload_consumer = None
+
         self.is_running = False
         self.event_loop = None  # Clear event loop reference
         logger.info("Certificate scheduler stopped")
     
-    async def _initial_scan(self):
+    async def _initial_scan(self) -> None:
         """Perform initial certificate scan and sync."""
         logger.info("Performing initial certificate scan")
         
         # Scan local certificates
-        self.cert_monitor.scan_certificates()
+        await self.cert_monitor.scan_certificates()
         
         # Update metrics
         metrics_collector.update_certificate_metrics(self.cert_monitor.certificates)
@@ -97,14 +195,21 @@ class CertificateScheduler:
         # Perform initial sync
         await self.sync_certificates()
     
-    async def sync_certificates(self):
+    async def _rescan_certificates(self) -> None:
+        """Rescan the certificate directory and refresh metrics."""
+        await self.cert_monitor.scan_certificates()
+        metrics_collector.update_certificate_metrics(self.cert_monitor.certificates)
+
+    async def sync_certificates(self) -> None:
         """Synchronize certificates from Secrets Manager."""
         if self.sync_in_progress:
             logger.warning("Certificate sync already in progress, skipping")
             return
 
         self.sync_in_progress = True
-        start_time = time.time()
+        start_time = time.monotonic()
+        # Certificate expiry in metrics is computed against the sync's start
+        now = datetime.now(timezone.utc)
         success = False
 
         try:
@@ -118,22 +223,23 @@ class CertificateScheduler:
                 success = True  # Not an error, just no certificates
                 return
 
-            certificates_updated = False
-
-            for secret_name, secret_data in secrets_data.items():
-                try:
-                    updated = await self._sync_single_certificate(secret_name, secret_data)
-                    if updated:
-                        certificates_updated = True
-                except Exception as e:
-                    logger.error(f"Error syncing certificate from secret {secret_name}: {e}")
-                    self.sync_errors.append(f"Sync error for {secret_name}: {str(e)}")
+            # Certificates are independent, so sync them concurrently
+            semaphore = asyncio.Semaphore(settings.max_concurrent_syncs)
+            results = await asyncio.gather(
+                *(
+                    self._sync_certificate_guarded(secret_name, secret_data, semaphore)
+                    for secret_name, secret_data in secrets_data.items()
+                )
+            )
+            certificates_updated = any(results)
+            self._save_sync_state()
 
-            # Rescan local certificates after sync
-            self.cert_monitor.scan_certificates()
+            # Reload only the local certificates written or changed since the
+            # last sync; the periodic full rescan catches anything else
+            await self.cert_monitor.rescan_paths(self.cert_monitor.drain_dirty())
 
             # Update metrics
-            metrics_collector.update_certificate_metrics(self.cert_monitor.certificates)
+            metrics_collector.update_certificate_metrics(self.cert_monitor.certificates, now=now)
 
             # Reload HAProxy if certificates were updated
             if certificates_updated:
@@ -141,7 +247,6 @@ class CertificateScheduler:
                 await haproxy_client.reload_certificates()
 
             success = True
-            self.last_sync_time = datetime.now()
             logger.info("Certificate synchronization completed successfully")
 
         except Exception as e:
@@ -150,8 +255,11 @@ class CertificateScheduler:
             metrics_collector.record_acm_request('sync_certificates', False)
 
         finally:
-            duration = time.time() - start_time
-            metrics_collector.record_sync_operation(success, duration)
+            duration = time.monotonic() - start_time
+            wall_now = time.time()
+            if success:
+                self.last_sync_wall = wall_now
+            metrics_collector.record_sync_operation(success, duration, wall_now=wall_now)
             self.sync_in_progress = False
 
     async def _get_secrets_data(self) -> Dict[str, Dict]:
@@ -190,6 +298,18 @@ class CertificateScheduler:
         logger.warning("No certificate discovery method configured. Set either CERT_ROTATION_TAG_KEY/TAG_VALUE or CERT_ROTATION_SECRETS_NAMES")
         return {}
 
+    async def _sync_certificate_guarded(
+        self, secret_name: str, secret_data: Dict, semaphore: asyncio.Semaphore
+    ) -> bool:
+        """Sync one certificate under the concurrency limit, recording failures."""
+        async with semaphore:
+            try:
+                return await self._sync_single_certificate(secret_name, secret_data)
+            except Exception as e:
+                logger.error(f"Error syncing certificate from secret {secret_name}: {e}")
+                self.sync_errors.append(f"Sync error for {secret_name}: {str(e)}")
+                return False
+
     async def _sync_single_certificate(self, secret_name: str, secret_data: Dict) -> bool:
         """
         Sync a single certificate from Secrets Manager.
@@ -219,15 +339,20 @@ class CertificateScheduler:
 
         certificate, private_key, certificate_chain = cert_data
 
-        # Save certificate to filesystem
+        # Save certificate to filesystem, off the event loop so concurrent
+        # syncs overlap their disk writes
         try:
-            self.cert_monitor.save_certificate(
+            await asyncio.to_thread(
+                self.cert_monitor.save_certificate,
                 cert_name,
                 certificate,
                 private_key,
                 certificate_chain
             )
             logger.info(f"Successfully saved certificate {cert_name}")
+            self._record_synced(
+                secret_name, secret_data, self._certificate_file_sha256(certificate, certificate_chain)
+            )
             return True
 
         except Exception as e:
@@ -237,65 +362,103 @@ class CertificateScheduler:
     async def _certificate_needs_update(self, secret_name: str, secret_data: Dict, cert_name: str) -> bool:
         """Check if a certificate needs to be downloaded/updated."""
 
-        # Check if certificate file exists locally
-        cert_file_path = self.cert_monitor.cert_path / f"{cert_name}.pem"
-
-        if not cert_file_path.exists():
-            logger.info(f"Certificate {cert_name} not found locally, will download")
-            return True
-
         # Get local certificate info
-        local_cert = self.cert_monitor.certificates.get(str(cert_file_path))
+        local_cert = self.cert_monitor.get_certificate_by_name(cert_name)
 
         if not local_cert:
-            logger.info(f"Could not parse local certificate {cert_name}, will re-download")
+            if (self.cert_monitor.cert_path / f"{cert_name}.pem").exists():
+                logger.info(f"Could not parse local certificate {cert_name}, will re-download")
+            else:
+                logger.info(f"Certificate {cert_name} not found locally, will download")
             return True
 
         # Compare based on secret metadata (version changes)
         metadata = secret_data.get('_metadata', {})
-        last_changed = metadata.get('last_changed_date')
-
-        if last_changed:
-            # If secret was changed recently, update the certificate
-            # This is a simple approach - you could store last sync timestamps for more precision
-            logger.info(f"Secret {secret_name} was recently changed, will update certificate")
+        state = self._sync_state.get(secret_name)
+        last_changed = parse_datetime(metadata.get('last_changed_date'))
+
+        # Only a change after the last recorded one needs an update. Without
+        # a recorded change date, e.g. state written before it was tracked,
+        # fall back to the version and content checks below.
+        last_synced_change = self._synced_changes.get(secret_name)
+        if last_changed and last_synced_change and last_changed > last_synced_change:
+            logger.info(f"Secret {secret_name} was changed since the last sync, will update certificate")
             return True
 
-        # For now, always check if the certificate content differs
-        # Extract certificate from secret and compare with local
+        # Same secret version as the last sync, and the local file is still
+        # exactly what was written then: nothing to do beyond recording a
+        # change date the state may be missing
+        version_id = metadata.get('version_id')
+        if (
+            state
+            and version_id
+            and state.get('version_id') == version_id
+            and state.get('cert_sha256') == local_cert.cert_sha256.hex()
+        ):
+            self._record_synced(secret_name, secret_data, local_cert.cert_sha256)
+            return False
+
+        # Otherwise compare the certificate file the secret would produce
+        # with the local one by hash
         try:
             cert_data = await self.secrets_client.extract_certificate_data(secret_data)
             if cert_data:
-                secret_cert, _, _ = cert_data
-                # Simple comparison - you could parse and compare serial numbers
-                if secret_cert.strip() != local_cert.cert_data.strip():
+                secret_cert, _, secret_chain = cert_data
+                secret_sha256 = self._certificate_file_sha256(secret_cert, secret_chain)
+                if secret_sha256 != local_cert.cert_sha256:
                     logger.info(f"Certificate {cert_name} content changed, will update")
                     return True
+                self._record_synced(secret_name, secret_data, secret_sha256)
         except Exception as e:
             logger.warning(f"Could not compare certificate content for {cert_name}: {e}")
             return True  # When in doubt, update
 
         return False
+
+    def _certificate_file_sha256(self, certificate: str, certificate_chain: Optional[str] = None) -> bytes:
+        """Hash the .pem file content save_certificate writes for a certificate."""
+        content = self.cert_monitor.certificate_file_content(certificate, certificate_chain)
+        return hashlib.sha256(content.encode()).digest()
     
-    def _on_certificate_file_changed(self, file_path: str):
+    def _on_certificate_file_changed(self, file_path: str) -> None:
         """Handle certificate file changes."""
         logger.info(f"Certificate file changed: {file_path}")
         metrics_collector.record_file_change('modified')
 
-        # Schedule HAProxy reload using the stored event loop
+        # Request a HAProxy reload on the stored event loop
         if self.is_running and self.event_loop and not self.event_loop.is_closed():
             try:
-                # Schedule the coroutine in the main event loop from this thread
-                asyncio.run_coroutine_threadsafe(
-                    self._handle_certificate_change(),
-                    self.event_loop
-                )
+                self.event_loop.call_soon_threadsafe(self._request_reload)
             except Exception as e:
                 logger.error(f"Error scheduling certificate change handler: {e}")
         else:
             logger.warning("Scheduler not running or event loop not available, cannot handle certificate change")
-    
-    async def _handle_certificate_change(self):
+
+    def _request_reload(self) -> None:
+        """Queue a HAProxy reload unless one is already pending."""
+        if self._reload_requests is None:
+            return
+        try:
+            self._reload_requests.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def _consume_reload_requests(self, requests: asyncio.Queue) -> None:
+        """
+        Reload HAProxy for queued certificate changes.
+
+        After a request the consumer waits reload_debounce_seconds, so every
+        change arriving in the meantime is covered by the same reload.
+        """
+        while True:
+            await requests.get()
+            await asyncio.sleep(settings.reload_debounce_seconds)
+            # Changes during the wait are covered by this reload
+            while not requests.empty():
+                requests.get_nowait()
+            await self._handle_certificate_change()
+
+    async def _handle_certificate_change(self) -> None:
         """Handle certificate file changes by reloading HAProxy."""
         try:
             await haproxy_client.reload_certificates()
@@ -306,7 +469,7 @@ class CertificateScheduler:
         """Get scheduler status information."""
         # Determine discovery method
         discovery_method = "none"
-        discovery_config = {}
+        discovery_config: Dict[str, Any] = {}
 
         if settings.tag_key and settings.tag_value:
             discovery_method = "tag-based"
@@ -323,12 +486,14 @@ class CertificateScheduler:
         return {
             'is_running': self.is_running,
             'sync_in_progress': self.sync_in_progress,
-            'last_sync_time': self.last_sync_time.isoformat() if self.last_sync_time else None,
+            'last_sync_time': (
+                datetime.fromtimestamp(self.last_sync_wall).isoformat() if self.last_sync_wall else None
+            ),
             'certificates_count': len(self.cert_monitor.certificates),
             'discovery_method': discovery_method,
             'discovery_config': discovery_config,
             'check_interval_minutes': settings.check_interval_minutes,
-            'recent_errors': self.sync_errors[-5:],  # Last 5 errors
+            'recent_errors': list(self.sync_errors)[-5:],  # Last 5 errors
             'next_sync': self._get_next_sync_time()
         }
     
@@ -336,5 +501,6 @@ class CertificateScheduler:
         """Get next scheduled sync time."""
         job = self.scheduler.get_job('cert_sync')
         if job and job.next_run_time:
-            return job.next_run_time.isoformat()
+            next_run: str = job.next_run_time.isoformat()
+            return next_run
         return "Not scheduled"
@@ -2,27 +2,69 @@
 AWS Secrets Manager client for certificate operations.
 """
 
+import asyncio
+import copy
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
+from cachetools import TTLCache
 
-from .config import settings
+try:
+    # orjson parses secret payloads several times faster; its JSONDecodeError
+    # subclasses json.JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - optional speedup
+    from json import loads as json_loads  # type: ignore[assignment]
+
+from .aws import get_client
+from .config import get_settings
+
+settings = get_settings()
 
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of secrets accepted by a single BatchGetSecretValue call
+BATCH_GET_MAX_SECRETS = 20
+
+# Largest ListSecrets page (MaxResults) the API accepts
+LIST_SECRETS_PAGE_SIZE = 100
+
+# Characters replaced to turn secret and domain names into file names
+_SECRET_NAME_TABLE = str.maketrans({'/': '_', ':': '_'})
+_DOMAIN_NAME_TABLE = str.maketrans({'*': 'wildcard', '.': '_'})
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Normalize a datetime or ISO 8601 string, e.g. from secret metadata or sync state."""
+    if not value or isinstance(value, datetime):
+        return value or None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
 
 class SecretsManagerClient:
     """AWS Secrets Manager client for certificate operations."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize Secrets Manager client."""
+        # Secret metadata and listings rarely change between polls, so cache
+        # DescribeSecret responses per secret and ListSecrets results per
+        # filter set. Secret values are never cached.
+        self._describe_cache: TTLCache[str, Dict] = TTLCache(maxsize=1024, ttl=settings.secrets_metadata_cache_ttl_seconds)
+        self._list_cache: TTLCache[str, List[Dict]] = TTLCache(maxsize=64, ttl=settings.secrets_metadata_cache_ttl_seconds)
+        # In-flight get_secret_value fetches, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task[Optional[Dict]]] = {}
+        # Set once BatchGetSecretValue is denied, e.g. by an IAM policy that
+        # only grants GetSecretValue; values are then fetched one by one
+        self._batch_get_denied = False
         try:
-            self.client = boto3.client('secretsmanager', region_name=settings.aws_region)
+            self.client = get_client('secretsmanager')
             logger.info(f"Initialized Secrets Manager client for region: {settings.aws_region}")
         except NoCredentialsError:
             logger.error("AWS credentials not found. Ensure EC2 instance has proper IAM role.")
@@ -31,34 +73,63 @@ class SecretsManagerClient:
             logger.error(f"Failed to initialize Secrets Manager client: {e}")
             raise
     
+    def _parse_secret_value(self, secret_name: str, response: Dict) -> Optional[Dict]:
+        """Parse a secret value response into secret data with metadata."""
+        # Parse the secret string as JSON
+        secret_string = response.get('SecretString')
+        if not secret_string:
+            logger.error(f"Secret {secret_name} has no SecretString")
+            return None
+
+        try:
+            secret_data: Dict = json_loads(secret_string)
+            # Add metadata from the response
+            secret_data['_metadata'] = {
+                'arn': response.get('ARN'),
+                'name': response.get('Name'),
+                'version_id': response.get('VersionId'),
+                'version_stages': response.get('VersionStages', []),
+                'created_date': response.get('CreatedDate'),
+                'last_accessed_date': response.get('LastAccessedDate'),
+                # Not returned by GetSecretValue; filled from the listing
+                'last_changed_date': None
+            }
+            return secret_data
+        except json.JSONDecodeError as e:
+            logger.error(f"Secret {secret_name} contains invalid JSON: {e}")
+            return None
+
     async def get_secret_value(self, secret_name: str) -> Optional[Dict]:
-        """Get secret value from Secrets Manager."""
+        """
+        Get the AWSCURRENT secret value from Secrets Manager.
+
+        Concurrent calls for the same secret share a single fetch.
+        """
+        task = self._inflight.get(secret_name)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_secret_value(secret_name))
+            self._inflight[secret_name] = task
+            task.add_done_callback(lambda done: self._finish_inflight(secret_name, done))
+
+        # Every caller, including the one that started the fetch, gets its own
+        # copy, so callers sharing the fetch never see each other's changes
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _finish_inflight(self, secret_name: str, task: asyncio.Task[Optional[Dict]]) -> None:
+        """Forget a finished in-flight fetch, retrieving its exception."""
+        self._inflight.pop(secret_name, None)
+        # Every waiter may have been cancelled, leaving the exception unread
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_secret_value(self, secret_name: str) -> Optional[Dict]:
+        """Fetch and parse the AWSCURRENT value of a secret."""
         try:
-            response = self.client.get_secret_value(SecretId=secret_name)
-            
-            # Parse the secret string as JSON
-            secret_string = response.get('SecretString')
-            if not secret_string:
-                logger.error(f"Secret {secret_name} has no SecretString")
-                return None
-            
-            try:
-                secret_data = json.loads(secret_string)
-                # Add metadata from the response
-                secret_data['_metadata'] = {
-                    'arn': response.get('ARN'),
-                    'name': response.get('Name'),
-                    'version_id': response.get('VersionId'),
-                    'version_stages': response.get('VersionStages', []),
-                    'created_date': response.get('CreatedDate'),
-                    'last_accessed_date': response.get('LastAccessedDate'),
-                    'last_changed_date': response.get('LastChangedDate')
-                }
-                return secret_data
-            except json.JSONDecodeError as e:
-                logger.error(f"Secret {secret_name} contains invalid JSON: {e}")
-                return None
-                
+            response = await asyncio.to_thread(
+                self.client.get_secret_value, SecretId=secret_name, VersionStage='AWSCURRENT'
+            )
+            return self._parse_secret_value(secret_name, response)
+
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'ResourceNotFoundException':
@@ -77,28 +148,176 @@ class SecretsManagerClient:
             logger.error(f"Unexpected error getting secret {secret_name}: {e}")
             raise
     
-    async def list_secrets(self, include_tags: bool = False) -> List[Dict]:
-        """List all secrets in Secrets Manager."""
+    async def batch_get_secret_values(self, secret_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get values for several secrets using BatchGetSecretValue.
+
+        Secrets are requested in chunks of BATCH_GET_MAX_SECRETS, with the
+        chunks fetched and parsed concurrently in worker threads. Secrets
+        that cannot be retrieved are logged and left out of the result; a
+        failing chunk only affects its own secrets. If BatchGetSecretValue
+        is not permitted, secrets are fetched with GetSecretValue instead.
+
+        Args:
+            secret_ids: Secret names or ARNs to fetch
+
+        Returns:
+            Dictionary of requested secret ids to secret data
+        """
+        if self._batch_get_denied:
+            return await self._get_secret_values_individually(secret_ids)
+
+        chunks = [
+            secret_ids[i:i + BATCH_GET_MAX_SECRETS]
+            for i in range(0, len(secret_ids), BATCH_GET_MAX_SECRETS)
+        ]
+        # Parse each chunk in the thread that fetched it, so the JSON parsing
+        # of large batches stays off the event loop
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._fetch_secret_values_batch, chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+
+        secrets: Dict[str, Dict] = {}
+        denied_ids: List[str] = []
+        for chunk, result in zip(chunks, results):
+            if not isinstance(result, BaseException):
+                secrets.update(result)
+            elif isinstance(result, ClientError) and result.response['Error']['Code'] == 'AccessDeniedException':
+                denied_ids.extend(chunk)
+            else:
+                for secret_id in chunk:
+                    logger.error(f"Error getting secret {secret_id}: {result}")
+
+        if denied_ids:
+            logger.warning(
+                "BatchGetSecretValue is not permitted, falling back to GetSecretValue per secret"
+            )
+            self._batch_get_denied = True
+            secrets.update(await self._get_secret_values_individually(denied_ids))
+
+        return secrets
+
+    async def _get_secret_values_individually(self, secret_ids: List[str]) -> Dict[str, Dict]:
+        """Get values for several secrets with concurrent GetSecretValue calls."""
+        results = await asyncio.gather(
+            *(self.get_secret_value(secret_id) for secret_id in secret_ids),
+            return_exceptions=True,
+        )
+
+        secrets: Dict[str, Dict] = {}
+        for secret_id, result in zip(secret_ids, results):
+            # get_secret_value has already logged failures
+            if result and not isinstance(result, BaseException):
+                secrets[secret_id] = result
+        return secrets
+
+    def _fetch_secret_values_batch(self, secret_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch and parse one BatchGetSecretValue chunk (blocking)."""
+        response = self.client.batch_get_secret_value(SecretIdList=secret_ids)
+        requested = set(secret_ids)
+
+        secrets = {}
+        for value in response.get('SecretValues', []):
+            # Key results by whichever identifier the caller used
+            secret_id = value.get('ARN') if value.get('ARN') in requested else value.get('Name')
+            secret_data = self._parse_secret_value(secret_id, value)
+            if secret_data:
+                secrets[secret_id] = secret_data
+
+        for error in response.get('Errors', []):
+            secret_id = error.get('SecretId')
+            if error.get('ErrorCode') == 'ResourceNotFoundException':
+                logger.warning(f"Secret not found: {secret_id}")
+            else:
+                logger.error(f"Error getting secret {secret_id}: {error.get('ErrorCode')} - {error.get('Message')}")
+
+        return secrets
+
+    async def _describe_cached(self, secret_id: str) -> Dict:
+        """Call DescribeSecret for a secret, serving repeated calls from cache."""
+        cached = self._describe_cache.get(secret_id)
+        if cached is not None:
+            return cached
+        response: Dict = await asyncio.to_thread(self.client.describe_secret, SecretId=secret_id)
+        self._describe_cache[secret_id] = response
+        return response
+
+    async def iter_secrets(self, filters: Optional[List[Dict]] = None) -> AsyncIterator[Dict]:
+        """
+        Yield secret list entries from ListSecrets page by page.
+
+        A listing that is iterated to the end is cached, and repeated calls
+        within the TTL are served from the cache.
+
+        Args:
+            filters: Optional ListSecrets filters, evaluated server-side
+        """
+        cache_key = json.dumps(filters, sort_keys=True)
+        cached = self._list_cache.get(cache_key)
+        if cached is not None:
+            # Copy the entries so callers don't mutate the cache
+            for secret in cached:
+                yield dict(secret)
+            return
+
+        paginate_kwargs: Dict[str, Any] = {'PaginationConfig': {'PageSize': LIST_SECRETS_PAGE_SIZE}}
+        if filters:
+            paginate_kwargs['Filters'] = filters
+        pages = iter(self.client.get_paginator('list_secrets').paginate(**paginate_kwargs))
+
+        # Fetch each page in a worker thread so the event loop can serve
+        # other requests while ListSecrets is paging
+        secrets = []
+        while (page := await asyncio.to_thread(next, pages, None)) is not None:
+            for secret in page.get('SecretList', []):
+                secrets.append(secret)
+                yield dict(secret)
+
+        self._list_cache[cache_key] = secrets
+
+    async def _describe_or_empty(self, secret_id: str) -> Dict:
+        """Describe a secret with DescribeSecret, or return {} if it cannot be described."""
         try:
-            secrets = []
-            paginator = self.client.get_paginator('list_secrets')
-            
-            for page in paginator.paginate():
-                secret_list = page.get('SecretList', [])
-                
-                # Add tags if requested
-                if include_tags:
-                    for secret in secret_list:
-                        secret_arn = secret.get('ARN')
-                        if secret_arn:
-                            try:
-                                tags_response = self.client.describe_secret(SecretId=secret_arn)
-                                secret['Tags'] = tags_response.get('Tags', [])
-                            except ClientError as e:
-                                logger.warning(f"Could not fetch tags for secret {secret_arn}: {e}")
-                                secret['Tags'] = []
-                
-                secrets.extend(secret_list)
+            return await self._describe_cached(secret_id)
+        except ClientError as e:
+            logger.warning(f"Could not describe secret {secret_id}: {e}")
+            return {}
+
+    @staticmethod
+    def _merge_listing_metadata(secret_data: Dict, entry: Dict, include_tags: bool) -> None:
+        """
+        Copy metadata from a ListSecrets or DescribeSecret entry into secret_data.
+
+        GetSecretValue and BatchGetSecretValue do not return LastChangedDate,
+        so it is taken from the entry instead.
+        """
+        metadata = secret_data['_metadata']
+        metadata['last_changed_date'] = entry.get('LastChangedDate')
+        if include_tags:
+            metadata['tags'] = entry.get('Tags', [])
+
+    async def list_secrets(
+        self, include_tags: bool = False, filters: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        List secrets in Secrets Manager.
+
+        Args:
+            include_tags: Whether to include tags for each secret
+            filters: Optional ListSecrets filters, evaluated server-side
+
+        Returns:
+            List of secret list entries
+        """
+        try:
+            secrets = [secret async for secret in self.iter_secrets(filters=filters)]
+
+            # ListSecrets already returns each secret's tags, leaving the key
+            # out for untagged secrets
+            if include_tags:
+                for secret in secrets:
+                    secret.setdefault('Tags', [])
             
             logger.debug(f"Found {len(secrets)} secrets in Secrets Manager")
             return secrets
@@ -108,65 +327,146 @@ class SecretsManagerClient:
             raise
     
     async def get_monitored_secrets(self, include_tags: bool = False) -> Dict[str, Dict]:
-        """Get details for all monitored secrets."""
+        """
+        Get details for all monitored secrets.
+
+        If a certificate tag is configured, named secrets without it are
+        skipped before any value is fetched.
+        """
         monitored_secrets = {}
-        
-        for secret_name in settings.secrets_names_list:
-            secret_data = await self.get_secret_value(secret_name)
+        secret_names = list(settings.secrets_names_list)
+
+        if secret_names and settings.certificate_tag_key and settings.certificate_tag_value:
+            candidates = await self._find_tagged_secrets(
+                settings.certificate_tag_key, settings.certificate_tag_value
+            )
+            identifiers = set(candidates).union(secret.get('ARN') for secret in candidates.values())
+            skipped = [secret_name for secret_name in secret_names if secret_name not in identifiers]
+            if skipped:
+                logger.info(
+                    f"Skipping secrets without tag {settings.certificate_tag_key}="
+                    f"{settings.certificate_tag_value}: {', '.join(skipped)}"
+                )
+                secret_names = [secret_name for secret_name in secret_names if secret_name in identifiers]
+
+        # Fetch all values with BatchGetSecretValue, 20 secrets per call
+        secret_values = await self.batch_get_secret_values(secret_names)
+
+        for secret_name in secret_names:
+            secret_data = secret_values.get(secret_name)
             if secret_data:
-                # Add tags if requested
-                if include_tags:
-                    try:
-                        tags_response = self.client.describe_secret(SecretId=secret_name)
-                        secret_data['_metadata']['tags'] = tags_response.get('Tags', [])
-                    except ClientError as e:
-                        logger.warning(f"Could not fetch tags for secret {secret_name}: {e}")
-                        secret_data['_metadata']['tags'] = []
-                
                 monitored_secrets[secret_name] = secret_data
             else:
                 logger.warning(f"Could not get data for monitored secret: {secret_name}")
-        
+
+        # Add the change date and tags, describing the secrets concurrently
+        descriptions = await asyncio.gather(
+            *(self._describe_or_empty(secret_name) for secret_name in monitored_secrets)
+        )
+        for secret_data, description in zip(monitored_secrets.values(), descriptions):
+            self._merge_listing_metadata(secret_data, description, include_tags)
+
         return monitored_secrets
 
+    async def describe_secret(self, secret_name: str, include_tags: bool = False) -> Optional[Dict]:
+        """
+        Get metadata for a single secret without its value.
+
+        Uses one DescribeSecret call; GetSecretValue is never called.
+
+        Returns:
+            {'_metadata': {...}}, or None if the secret cannot be described
+        """
+        try:
+            response = await self._describe_cached(secret_name)
+
+            metadata = {
+                'arn': response.get('ARN'),
+                'name': response.get('Name'),
+                'description': response.get('Description'),
+                'created_date': response.get('CreatedDate'),
+                'last_accessed_date': response.get('LastAccessedDate'),
+                'last_changed_date': response.get('LastChangedDate'),
+                'last_rotated_date': response.get('LastRotatedDate'),
+                'version_ids_to_stages': response.get('VersionIdsToStages', {}),
+                'owning_service': response.get('OwningService'),
+                'primary_region': response.get('PrimaryRegion'),
+                'replication_status': response.get('ReplicationStatus', [])
+            }
+
+            if include_tags:
+                metadata['tags'] = response.get('Tags', [])
+
+            return {'_metadata': metadata}
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'ResourceNotFoundException':
+                logger.warning(f"Secret not found: {secret_name}")
+            else:
+                logger.error(f"Error getting metadata for secret {secret_name}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error getting metadata for secret {secret_name}: {e}")
+
+        return None
+
     async def get_monitored_secrets_metadata(self, include_tags: bool = False) -> Dict[str, Dict]:
         """Get metadata for all monitored secrets without sensitive data."""
-        monitored_secrets = {}
+        # Get basic secret info without the actual secret values, describing
+        # the secrets concurrently
+        secret_names = settings.secrets_names_list
+        results = await asyncio.gather(
+            *(self.describe_secret(secret_name, include_tags=include_tags) for secret_name in secret_names)
+        )
 
-        for secret_name in settings.secrets_names_list:
-            try:
-                # Get basic secret info without the actual secret value
-                response = self.client.describe_secret(SecretId=secret_name)
-
-                metadata = {
-                    'arn': response.get('ARN'),
-                    'name': response.get('Name'),
-                    'description': response.get('Description'),
-                    'created_date': response.get('CreatedDate'),
-                    'last_accessed_date': response.get('LastAccessedDate'),
-                    'last_changed_date': response.get('LastChangedDate'),
-                    'last_rotated_date': response.get('LastRotatedDate'),
-                    'version_ids_to_stages': response.get('VersionIdsToStages', {}),
-                    'owning_service': response.get('OwningService'),
-                    'primary_region': response.get('PrimaryRegion'),
-                    'replication_status': response.get('ReplicationStatus', [])
-                }
-
-                if include_tags:
-                    metadata['tags'] = response.get('Tags', [])
-
-                monitored_secrets[secret_name] = {'_metadata': metadata}
-
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                if error_code == 'ResourceNotFoundException':
-                    logger.warning(f"Secret not found: {secret_name}")
-                else:
-                    logger.error(f"Error getting metadata for secret {secret_name}: {e}")
-            except Exception as e:
-                logger.error(f"Unexpected error getting metadata for secret {secret_name}: {e}")
+        return {
+            secret_name: secret_metadata
+            for secret_name, secret_metadata in zip(secret_names, results)
+            if secret_metadata
+        }
 
-        return monitored_secrets
+    @staticmethod
+    async def _match_tagged_secrets(
+        secrets: AsyncIterator[Dict], tag_key: str, tag_value: str
+    ) -> Dict[str, Dict]:
+        """Collect the list entries of secrets tagged tag_key=tag_value, by name."""
+        matching_secrets = {}
+
+        # The server-side filters match the key and the value independently,
+        # so confirm the exact key/value pair here
+        async for secret in secrets:
+            secret_name = secret.get('Name')
+            secret_tags = secret.get('Tags', [])
+
+            # Check if the secret has the required tag; tag keys are unique
+            # per secret
+            tags_map = {tag.get('Key'): tag.get('Value') for tag in secret_tags}
+
+            if secret_name and tags_map.get(tag_key) == tag_value:
+                logger.debug(f"Found secret with matching tag: {secret_name}")
+                matching_secrets[secret_name] = secret
+
+        return matching_secrets
+
+    async def _find_tagged_secrets(self, tag_key: str, tag_value: str) -> Dict[str, Dict]:
+        """List the secrets tagged tag_key=tag_value, keyed by name."""
+        # Let Secrets Manager filter by tag. ListSecrets returns each
+        # secret's tags, so no per-secret describe call is needed.
+        try:
+            return await self._match_tagged_secrets(
+                self.iter_secrets(filters=[
+                    {'Key': 'tag-key', 'Values': [tag_key]},
+                    {'Key': 'tag-value', 'Values': [tag_value]},
+                ]),
+                tag_key,
+                tag_value,
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'InvalidParameterException':
+                raise
+            # Endpoint rejects the filters; list everything and match locally
+            logger.warning(f"Tag filters rejected by ListSecrets, filtering client-side: {e}")
+            return await self._match_tagged_secrets(self.iter_secrets(), tag_key, tag_value)
 
     async def get_secrets_by_tag(self, tag_key: str, tag_value: str, include_tags: bool = True) -> Dict[str, Dict]:
         """
@@ -181,36 +481,18 @@ class SecretsManagerClient:
             Dictionary of secret names to secret data
         """
         try:
-            secrets_with_tag = {}
+            matching_secrets = await self._find_tagged_secrets(tag_key, tag_value)
 
-            # First, list all secrets with tags
-            all_secrets = await self.list_secrets(include_tags=True)
+            # Get the full secret data for all matches in batches
+            secrets_with_tag = await self.batch_get_secret_values(list(matching_secrets))
 
-            # Filter secrets by tag
-            for secret in all_secrets:
-                secret_name = secret.get('Name')
-                secret_tags = secret.get('Tags', [])
-
-                # Check if the secret has the required tag
-                has_matching_tag = False
-                for tag in secret_tags:
-                    if tag.get('Key') == tag_key and tag.get('Value') == tag_value:
-                        has_matching_tag = True
-                        break
-
-                if has_matching_tag and secret_name:
-                    logger.debug(f"Found secret with matching tag: {secret_name}")
-
-                    # Get the full secret data
-                    secret_data = await self.get_secret_value(secret_name)
-                    if secret_data:
-                        # Add tags to metadata if requested
-                        if include_tags:
-                            secret_data['_metadata']['tags'] = secret_tags
-
-                        secrets_with_tag[secret_name] = secret_data
-                    else:
-                        logger.warning(f"Could not get data for secret with matching tag: {secret_name}")
+            for secret_name, secret in matching_secrets.items():
+                secret_data = secrets_with_tag.get(secret_name)
+                if not secret_data:
+                    logger.warning(f"Could not get data for secret with matching tag: {secret_name}")
+                else:
+                    # Add the change date, and tags if requested, from the list entry
+                    self._merge_listing_metadata(secret_data, secret, include_tags)
 
             logger.info(f"Found {len(secrets_with_tag)} secrets with tag {tag_key}={tag_value}")
             return secrets_with_tag
@@ -240,17 +522,17 @@ class SecretsManagerClient:
         """Extract a suitable filename from secret data."""
         # Try to get name from metadata
         metadata = secret_data.get('_metadata', {})
-        secret_name = metadata.get('name', '')
+        secret_name: str = metadata.get('name', '')
         
         if secret_name:
             # Clean up the secret name for use as filename
-            safe_name = secret_name.replace('/', '_').replace(':', '_')
+            safe_name = secret_name.translate(_SECRET_NAME_TABLE)
             return safe_name
         
         # Try to get domain name from certificate data
-        domain_name = secret_data.get('domain_name', '')
+        domain_name: str = secret_data.get('domain_name', '')
         if domain_name:
-            safe_name = domain_name.replace('*', 'wildcard').replace('.', '_')
+            safe_name = domain_name.translate(_DOMAIN_NAME_TABLE)
             return safe_name
         
         # Fallback to a generic name
@@ -258,17 +540,14 @@ class SecretsManagerClient:
     
     def validate_certificate_secret(self, secret_data: Dict) -> bool:
         """Validate that secret contains required certificate data."""
-        required_fields = ['certificate', 'private_key']
-        
-        for field in required_fields:
-            if field not in secret_data:
-                logger.error(f"Secret missing required field: {field}")
-                return False
-            
-            if not secret_data[field]:
-                logger.error(f"Secret field {field} is empty")
+        for field in ('certificate', 'private_key'):
+            if not secret_data.get(field):
+                if field not in secret_data:
+                    logger.error(f"Secret missing required field: {field}")
+                else:
+                    logger.error(f"Secret field {field} is empty")
                 return False
-        
+
         return True
     
     async def extract_certificate_data(self, secret_data: Dict) -> Optional[Tuple[str, str, str]]:
@@ -287,11 +566,13 @@ class SecretsManagerClient:
         Returns:
             Tuple of (certificate, private_key, certificate_chain) or None if invalid
         """
-        if not self.validate_certificate_secret(secret_data):
+        certificate = secret_data.get('certificate')
+        private_key = secret_data.get('private_key')
+        if not (certificate and private_key):
+            # Run the validation only to log what is wrong
+            self.validate_certificate_secret(secret_data)
             return None
-        
-        certificate = secret_data.get('certificate', '')
-        private_key = secret_data.get('private_key', '')
+
         certificate_chain = secret_data.get('certificate_chain', '')
-        
+
         return certificate, private_key, certificate_chain
@@ -0,0 +1,141 @@
+"""
+Tests for the CertificateMonitor indexes, expiry heap and change handling.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from cert_rotation.cert_monitor import CertificateInfo, CertificateMonitor
+from cert_rotation.config import get_settings
+
+from .certificates import make_certificate
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    """Create a monitor over a temporary certificate directory."""
+    with patch.object(get_settings(), 'cert_path', tmp_path):
+        yield CertificateMonitor()
+
+
+def make_info(monitor, name, common_name, **kwargs):
+    """Build a CertificateInfo for <name>.pem in the monitor's directory."""
+    certificate, _ = make_certificate(common_name, **kwargs)
+    return CertificateInfo(str(monitor.cert_path / f"{name}.pem"), certificate.encode())
+
+
+class TestCertificateIndexes:
+    """Test keeping the indexes in step with stored certificates."""
+
+    def test_replacing_same_path(self, monitor):
+        """Test that replacing a file drops the old certificate's index entries."""
+        old = make_info(monitor, 'web', 'old.example.com')
+        new = make_info(monitor, 'web', 'new.example.com')
+
+        monitor._store_certificate(old)
+        monitor._store_certificate(new)
+
+        assert monitor.get_certificate_by_domain('old.example.com') is None
+        assert monitor.get_certificate_by_serial(old.serial_number) is None
+        assert monitor.get_certificate_by_domain('new.example.com') is new
+        assert monitor.get_certificate_by_serial(new.serial_number) is new
+        assert monitor.get_certificate_by_name('web') is new
+        assert monitor.get_expiring_certificates(30) == [new]
+
+    def test_deleting_file(self, monitor):
+        """Test that forgetting a certificate removes it from every index."""
+        cert_info = make_info(monitor, 'web', 'example.com')
+        monitor._store_certificate(cert_info)
+
+        assert monitor._forget_certificate(cert_info.path) is cert_info
+
+        assert monitor.certificates == {}
+        assert monitor._by_domain == {}
+        assert monitor._by_serial == {}
+        assert monitor.get_certificate_by_name('web') is None
+        assert monitor.get_expiring_certificates(30) == []
+
+    def test_duplicate_domain_falls_back(self, monitor):
+        """Test that removing one of two files for a domain keeps the other."""
+        first = make_info(monitor, 'first', 'example.com')
+        second = make_info(monitor, 'second', 'example.com')
+        monitor._store_certificate(first)
+        monitor._store_certificate(second)
+
+        monitor._forget_certificate(first.path)
+
+        assert monitor.get_certificate_by_domain('example.com') is second
+
+    def test_stale_heap_entries_are_compacted(self, monitor):
+        """Test that the heap is rebuilt once stale entries outnumber live ones."""
+        live = make_info(monitor, 'live', 'live.example.com')
+        monitor._store_certificate(live)
+
+        for _ in range(3):
+            monitor._store_certificate(make_info(monitor, 'web', 'example.com'))
+        # Two stale entries for two live certificates are kept
+        assert len(monitor._expiry_heap) == 4
+        assert monitor._stale_expiry_entries == 2
+
+        replacement = make_info(monitor, 'web', 'example.com')
+        monitor._store_certificate(replacement)
+
+        # A third stale entry outnumbers the live ones and triggers compaction
+        assert sorted(entry[3].path for entry in monitor._expiry_heap) == sorted(
+            [live.path, replacement.path]
+        )
+        assert monitor._stale_expiry_entries == 0
+        assert set(monitor.get_expiring_certificates(30)) == {live, replacement}
+
+
+class TestExpiringCertificates:
+    """Test get_expiring_certificates against the days_until_expiry boundary."""
+
+    def test_threshold_boundary(self, monitor):
+        """Test that certificates exactly threshold days out are included."""
+        now = datetime.now(timezone.utc)
+        inside = make_info(monitor, 'inside', 'inside.example.com', expires=now + timedelta(days=30, hours=23))
+        outside = make_info(monitor, 'outside', 'outside.example.com', expires=now + timedelta(days=31, hours=1))
+        for cert_info in (outside, inside):
+            monitor._store_certificate(cert_info)
+
+        assert inside.days_until_expiry == 30
+        assert outside.days_until_expiry == 31
+        assert monitor.get_expiring_certificates(30) == [inside]
+        assert monitor.get_expiring_certificates(31) == [inside, outside]
+
+    def test_soonest_first_and_expired(self, monitor):
+        """Test that results are ordered by expiry and include expired certificates."""
+        now = datetime.now(timezone.utc)
+        later = make_info(monitor, 'later', 'later.example.com', days=20)
+        expired = make_info(monitor, 'expired', 'expired.example.com', expires=now - timedelta(hours=1))
+        sooner = make_info(monitor, 'sooner', 'sooner.example.com', days=5)
+        for cert_info in (later, expired, sooner):
+            monitor._store_certificate(cert_info)
+
+        assert monitor.get_expiring_certificates(30) == [expired, sooner, later]
+        assert monitor.get_expiring_certificates(10) == [expired, sooner]
+
+
+class TestChangeConsumer:
+    """Test reloading certificates reported by the file watcher."""
+
+    @pytest.mark.asyncio
+    async def test_reload_clears_dirty_path(self, monitor):
+        """Test that a path reloaded by the consumer is not rescanned again."""
+        path = monitor.save_certificate('web', *make_certificate('example.com'))
+        queue: asyncio.Queue = asyncio.Queue()
+        notified = asyncio.Event()
+        monitor.add_change_callback(lambda _: notified.set())
+
+        with patch.object(get_settings(), 'change_debounce_seconds', 0):
+            consumer = asyncio.create_task(monitor._consume_changes(queue))
+            queue.put_nowait(path)
+            await asyncio.wait_for(notified.wait(), timeout=5)
+            consumer.cancel()
+
+        assert monitor.get_certificate_by_name('web').path == path
+        assert monitor.drain_dirty() == set()
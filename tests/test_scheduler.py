@@ -0,0 +1,174 @@
+"""
+Tests for the CertificateScheduler update decision and sync state.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from cert_rotation.config import get_settings
+from cert_rotation.scheduler import SYNC_STATE_FILE, CertificateScheduler
+
+from .certificates import make_certificate
+
+
+def make_secret(certificate, private_key, version_id='v1', last_changed=None):
+    """Secret data as returned by the secrets client."""
+    return {
+        'certificate': certificate,
+        'private_key': private_key,
+        '_metadata': {
+            'name': 'web-cert',
+            'version_id': version_id,
+            'last_changed_date': last_changed or datetime(2024, 1, 1, tzinfo=timezone.utc),
+        },
+    }
+
+
+@pytest.fixture
+def cert_path(tmp_path):
+    """Point the certificate directory at a temporary path."""
+    with patch.object(get_settings(), 'cert_path', tmp_path):
+        yield tmp_path
+
+
+def make_scheduler():
+    """Create a scheduler with a mocked secrets client."""
+    with patch('cert_rotation.scheduler.SecretsManagerClient') as mock_client_class:
+        mock_client = Mock()
+        mock_client.extract_certificate_data = AsyncMock(
+            side_effect=lambda data: (data['certificate'], data['private_key'], '')
+        )
+        mock_client_class.return_value = mock_client
+        return CertificateScheduler()
+
+
+async def write_local(scheduler, certificate, private_key):
+    """Save a certificate as web-cert and load it into the monitor."""
+    scheduler.cert_monitor.save_certificate('web-cert', certificate, private_key)
+    await scheduler.cert_monitor.rescan_paths(scheduler.cert_monitor.drain_dirty())
+
+
+class TestCertificateNeedsUpdate:
+    """Test the decision whether a synced certificate must be rewritten."""
+
+    @pytest.mark.asyncio
+    async def test_matching_version_skips_comparison(self, cert_path):
+        """Test that an unchanged version and file need no update or content check."""
+        scheduler = make_scheduler()
+        certificate, private_key = make_certificate('example.com')
+        secret = make_secret(certificate, private_key)
+        await write_local(scheduler, certificate, private_key)
+        local_cert = scheduler.cert_monitor.get_certificate_by_name('web-cert')
+        scheduler._record_synced('web-cert', secret, local_cert.cert_sha256)
+
+        assert not await scheduler._certificate_needs_update('web-cert', secret, 'web-cert')
+        scheduler.secrets_client.extract_certificate_data.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changed_local_file_is_rewritten(self, cert_path):
+        """Test that a local file no longer matching the synced hash is updated."""
+        scheduler = make_scheduler()
+        certificate, private_key = make_certificate('example.com')
+        secret = make_secret(certificate, private_key)
+        await write_local(scheduler, certificate, private_key)
+        local_cert = scheduler.cert_monitor.get_certificate_by_name('web-cert')
+        scheduler._record_synced('web-cert', secret, local_cert.cert_sha256)
+
+        # Something else replaced the file on disk
+        await write_local(scheduler, *make_certificate('other.example.com'))
+
+        assert await scheduler._certificate_needs_update('web-cert', secret, 'web-cert')
+
+    @pytest.mark.asyncio
+    async def test_new_version_with_same_content_is_recorded(self, cert_path):
+        """Test that a new version with identical content only updates the state."""
+        scheduler = make_scheduler()
+        certificate, private_key = make_certificate('example.com')
+        await write_local(scheduler, certificate, private_key)
+        local_cert = scheduler.cert_monitor.get_certificate_by_name('web-cert')
+        scheduler._record_synced('web-cert', make_secret(certificate, private_key), local_cert.cert_sha256)
+
+        secret = make_secret(certificate, private_key, version_id='v2')
+
+        assert not await scheduler._certificate_needs_update('web-cert', secret, 'web-cert')
+        assert scheduler._sync_state['web-cert']['version_id'] == 'v2'
+
+    @pytest.mark.asyncio
+    async def test_newer_last_changed_date_forces_update(self, cert_path):
+        """Test that a change after the last sync forces an update."""
+        scheduler = make_scheduler()
+        certificate, private_key = make_certificate('example.com')
+        secret = make_secret(certificate, private_key)
+        await write_local(scheduler, certificate, private_key)
+        local_cert = scheduler.cert_monitor.get_certificate_by_name('web-cert')
+        scheduler._record_synced('web-cert', secret, local_cert.cert_sha256)
+
+        changed = make_secret(
+            certificate, private_key, last_changed=datetime(2024, 6, 1, tzinfo=timezone.utc)
+        )
+
+        assert await scheduler._certificate_needs_update('web-cert', changed, 'web-cert')
+
+    @pytest.mark.asyncio
+    async def test_state_without_last_changed_date(self, cert_path):
+        """Test that state recorded without a change date falls back to the version check."""
+        scheduler = make_scheduler()
+        certificate, private_key = make_certificate('example.com')
+        await write_local(scheduler, certificate, private_key)
+        local_cert = scheduler.cert_monitor.get_certificate_by_name('web-cert')
+        scheduler._sync_state['web-cert'] = {
+            'version_id': 'v1',
+            'cert_sha256': local_cert.cert_sha256.hex(),
+            'last_changed': None,
+        }
+
+        secret = make_secret(certificate, private_key)
+
+        assert not await scheduler._certificate_needs_update('web-cert', secret, 'web-cert')
+        scheduler.secrets_client.extract_certificate_data.assert_not_called()
+        assert scheduler._synced_changes['web-cert'] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_missing_local_certificate(self, cert_path):
+        """Test that a certificate not on disk is downloaded."""
+        scheduler = make_scheduler()
+        secret = make_secret(*make_certificate('example.com'))
+
+        assert await scheduler._certificate_needs_update('web-cert', secret, 'web-cert')
+
+
+class TestSyncState:
+    """Test persisting the sync state next to the certificates."""
+
+    def test_round_trip(self, cert_path):
+        """Test that recorded state survives a restart."""
+        scheduler = make_scheduler()
+        secret = make_secret('cert', 'key')
+        scheduler._record_synced('web-cert', secret, b'\x01' * 32)
+        scheduler._save_sync_state()
+
+        restarted = make_scheduler()
+
+        assert restarted._sync_state == scheduler._sync_state
+        assert restarted._sync_state['web-cert']['cert_sha256'] == '01' * 32
+        assert restarted._synced_changes['web-cert'] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_missing_state_file(self, cert_path):
+        """Test that a missing state file starts empty."""
+        scheduler = make_scheduler()
+
+        assert scheduler._sync_state == {}
+        assert not (cert_path / SYNC_STATE_FILE).exists()
+
+    @pytest.mark.parametrize('content', ['{not json', json.dumps(['web-cert']), json.dumps({'web-cert': 'v1'})])
+    def test_corrupt_state_file(self, cert_path, content):
+        """Test that an unreadable or malformed state file is ignored."""
+        (cert_path / SYNC_STATE_FILE).write_text(content)
+
+        scheduler = make_scheduler()
+
+        assert scheduler._sync_state == {}
+        assert scheduler._synced_changes == {}